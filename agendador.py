@@ -0,0 +1,63 @@
+import asyncio
+import threading
+
+
+# Temporizadores de uma sessão (ex.: o autoavanço do jogo de figuras), por
+# chave. Só existe uma tarefa pendente por chave: agendar de novo enquanto ela
+# roda não cria outra, a menos que substituir=True, que cancela a anterior.
+# Tudo é cancelado quando a sessão desconecta
+class Agendador:
+    def __init__(self, loop):
+        self.loop = loop
+        self._tarefas = {}
+        self._lock = threading.Lock()
+
+    # Pode ser chamado de qualquer thread (os handlers síncronos do Flet rodam fora do loop).
+    # Devolve False quando já havia uma tarefa pendente com a mesma chave
+    def agendar(self, chave, funcao, *args, substituir=False):
+        with self._lock:
+            anterior = self._tarefas.get(chave)
+            if anterior is not None and not anterior.done():
+                if not substituir:
+                    return False
+                anterior.cancel()
+
+            futuro = asyncio.run_coroutine_threadsafe(funcao(*args), self.loop)
+            self._tarefas[chave] = futuro
+        futuro.add_done_callback(lambda f: self._terminar(chave, f))
+        return True
+
+    def _terminar(self, chave, futuro):
+        with self._lock:
+            if self._tarefas.get(chave) is futuro:
+                del self._tarefas[chave]
+
+    def pendente(self, chave):
+        with self._lock:
+            futuro = self._tarefas.get(chave)
+            return futuro is not None and not futuro.done()
+
+    def cancelar(self, chave):
+        with self._lock:
+            futuro = self._tarefas.pop(chave, None)
+        if futuro is not None:
+            futuro.cancel()
+
+    def cancelar_todas(self):
+        with self._lock:
+            futuros = list(self._tarefas.values())
+            self._tarefas.clear()
+        for futuro in futuros:
+            futuro.cancel()
+
+    def __len__(self):
+        with self._lock:
+            return sum(1 for futuro in self._tarefas.values() if not futuro.done())
+
+
+def obter_agendador(page):
+    agendador = page.session.get("agendador")
+    if agendador is None:
+        agendador = Agendador(page.loop)
+        page.session.set("agendador", agendador)
+    return agendador
@@ -0,0 +1,59 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from busca_palavras import buscar_palavras_relacionadas, obter_indice
+from cache_palavras import normalizar_palavra, obter_cache
+
+# Configuração do aquecimento do cache (pode ser alterada por variáveis de ambiente)
+PALAVRAS_POPULARES_ARQUIVO = os.getenv("PALAVRAS_POPULARES", "palavras_populares.txt")
+AQUECIMENTO_RECENTES = int(os.getenv("AQUECIMENTO_RECENTES", 50))
+AQUECIMENTO_TRABALHADORES = int(os.getenv("AQUECIMENTO_TRABALHADORES", 2))
+# Com vários servidores (lancador.py), só um deles aquece o cache compartilhado
+AQUECIMENTO_ATIVO = os.getenv("AQUECIMENTO_ATIVO", "1") == "1"
+
+
+def ler_palavras_populares(arquivo=PALAVRAS_POPULARES_ARQUIVO):
+    if not os.path.exists(arquivo):
+        return []
+    with open(arquivo, encoding="utf-8") as f:
+        linhas = (linha.split("#", 1)[0].strip() for linha in f)
+        return [linha for linha in linhas if linha]
+
+
+# Palavras a aquecer: as da lista de populares e as mais buscadas recentemente,
+# sem repetição e só as que ainda não têm resultado válido no cache
+def palavras_para_aquecer():
+    cache = obter_cache()
+    palavras = []
+    vistas = set()
+    for palavra in ler_palavras_populares() + cache.mais_usadas(AQUECIMENTO_RECENTES):
+        palavra = normalizar_palavra(palavra)
+        if palavra not in vistas and not cache.contem(palavra):
+            vistas.add(palavra)
+            palavras.append(palavra)
+    return palavras
+
+
+def aquecer_cache():
+    if obter_indice() is not None:
+        # Com o índice local as buscas já são instantâneas
+        return
+
+    inicio = time.monotonic()
+    palavras = palavras_para_aquecer()
+    with ThreadPoolExecutor(max_workers=AQUECIMENTO_TRABALHADORES, thread_name_prefix="aquecimento") as executor:
+        resultados = list(executor.map(buscar_palavras_relacionadas, palavras))
+
+    aquecidas = sum(1 for resultado in resultados if resultado)
+    print(f"Cache aquecido: {aquecidas}/{len(palavras)} palavras em {time.monotonic() - inicio:.1f}s")
+
+
+# Aquece o cache em segundo plano, sem atrasar o início do servidor
+def iniciar_aquecimento():
+    if not AQUECIMENTO_ATIVO:
+        return None
+    thread = threading.Thread(target=aquecer_cache, name="aquecimento", daemon=True)
+    thread.start()
+    return thread
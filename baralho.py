@@ -0,0 +1,69 @@
+import random
+
+
+# Sorteio sem repetição: os itens são tirados em ordem embaralhada, cada
+# tirada custa O(1) e nenhum item volta antes de todos terem saído. Quando o
+# baralho acaba ele é embaralhado de novo, sem começar pelo último item tirado.
+#
+# A lista de itens não é copiada: itens adicionados a ela depois (as palavras
+# que a busca ainda está trazendo) entram em uma posição aleatória do que
+# ainda falta tirar. Com a mesma semente, a sequência é sempre a mesma
+class Baralho:
+    __slots__ = ("itens", "aleatorio", "_ordem", "_posicao", "_ultimo")
+
+    def __init__(self, itens, semente=None, aleatorio=None):
+        self.itens = itens
+        self.aleatorio = aleatorio or random.Random(semente)
+        self._ordem = []
+        self._posicao = 0
+        self._ultimo = None
+
+    def _incluir_novos(self):
+        ordem = self._ordem
+        while len(ordem) < len(self.itens):
+            ordem.append(len(ordem))
+            j = self.aleatorio.randint(self._posicao, len(ordem) - 1)
+            ordem[j], ordem[-1] = ordem[-1], ordem[j]
+
+    def _embaralhar(self):
+        ordem = self._ordem
+        self.aleatorio.shuffle(ordem)
+        if len(ordem) > 1 and ordem[0] == self._ultimo:
+            j = self.aleatorio.randint(1, len(ordem) - 1)
+            ordem[0], ordem[j] = ordem[j], ordem[0]
+        self._posicao = 0
+
+    def tirar(self):
+        return self.itens[self.tirar_indice()]
+
+    # Como tirar, mas devolve a posição do item na lista
+    def tirar_indice(self):
+        if not self.itens:
+            raise IndexError("baralho vazio")
+        self._incluir_novos()
+        if self._posicao >= len(self._ordem):
+            self._embaralhar()
+
+        indice = self._ordem[self._posicao]
+        self._posicao += 1
+        self._ultimo = indice
+        return indice
+
+    # Posição do baralho, para continuar a mesma sequência em outra sessão ou servidor
+    def estado(self):
+        return {"ordem": list(self._ordem), "posicao": self._posicao, "ultimo": self._ultimo}
+
+    # Só aceita o estado de um baralho da mesma lista (ou de uma parte inicial dela,
+    # quando a lista cresceu depois); devolve False e mantém o baralho como está se não for
+    def restaurar(self, estado):
+        ordem = estado.get("ordem", [])
+        posicao = estado.get("posicao", 0)
+        if len(ordem) > len(self.itens) or sorted(ordem) != list(range(len(ordem))) or not 0 <= posicao <= len(ordem):
+            return False
+        self._ordem = list(ordem)
+        self._posicao = posicao
+        self._ultimo = estado.get("ultimo")
+        return True
+
+    def __len__(self):
+        return len(self.itens)
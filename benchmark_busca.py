@@ -0,0 +1,160 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import busca_palavras
+from busca_palavras import CATEGORIAS_INDESEJADAS, buscar_palavras_relacionadas, buscar_palavras_relacionadas_em_lotes
+import fake_conceptnet
+
+# Benchmark da busca de palavras relacionadas contra a ConceptNet falsa
+# (fake_conceptnet.py, em um processo separado). Mede latência (p50/p95/p99), vazão com N chamadas
+# concorrentes e bytes transferidos para cada variante da busca.
+#
+#   python benchmark_busca.py --concorrencia 1 10 30 --latencia 0.2
+#   python benchmark_busca.py --mesma-palavra    # turma inteira buscando "escola"
+#
+# O cache em disco e o índice local ficam desligados durante as medições.
+
+
+# Implementação original da busca (um endpoint por vez, sem sessão e sem
+# timeout), mantida só como referência para comparar
+def busca_sequencial(palavra):
+    base_url = busca_palavras.BASE_URL
+    palavras_relacionadas = {palavra.lower(), palavra.upper(), palavra.capitalize()}
+    for endpoint in busca_palavras._endpoints_pt(palavra):
+        response = requests.get(base_url + endpoint)
+        response.raise_for_status()
+        for edge in response.json().get("edges", []):
+            if f"/c/pt/{palavra}" in edge["start"]["@id"]:
+                palavra_alvo = edge["end"]["label"].lower()
+            else:
+                palavra_alvo = edge["start"]["label"].lower()
+            if (palavra_alvo.replace(" ", "").isalpha() and
+                3 <= len(palavra_alvo) <= 25 and
+                not any(cat in palavra_alvo for cat in CATEGORIAS_INDESEJADAS)):
+                palavras_relacionadas.add(palavra_alvo)
+
+    if len(palavras_relacionadas) < 30:
+        for endpoint in busca_palavras._endpoints_en(palavra):
+            response = requests.get(base_url + endpoint)
+            if response.status_code == 200:
+                for edge in response.json().get("edges", []):
+                    palavras_relacionadas.add(edge["end"]["label"].lower())
+
+    return sorted(palavras_relacionadas, key=len)[:100]
+
+
+def busca_paralela(palavra):
+    return buscar_palavras_relacionadas(palavra, usar_cache=False)
+
+
+def busca_em_lotes(palavra):
+    return [p for lote in buscar_palavras_relacionadas_em_lotes(palavra, usar_cache=False) for p in lote]
+
+
+# Tempo até o jogo poder começar (10 palavras) na busca em lotes
+def primeiro_lote_util(palavra, minimo=10):
+    palavras = 0
+    for lote in buscar_palavras_relacionadas_em_lotes(palavra, usar_cache=False):
+        palavras += len(lote)
+        if palavras >= minimo:
+            break
+    return palavras
+
+
+VARIANTES = {
+    "sequencial (original)": busca_sequencial,
+    "paralela": busca_paralela,
+    "em lotes (completa)": busca_em_lotes,
+    "em lotes (10 palavras)": primeiro_lote_util,
+}
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, round(p / 100 * len(ordenados) + 0.5) - 1))
+    return ordenados[indice]
+
+
+def medir(funcao, url, chamadas, concorrencia, mesma_palavra):
+    palavras = ["escola" if mesma_palavra else f"palavra{i}" for i in range(chamadas)]
+    latencias = []
+    erros = 0
+
+    # Erro também quando a busca não traz palavras relacionadas: as buscas
+    # devolvem lista vazia (ou só as 3 grafias da própria palavra) ao falhar
+    def chamar(palavra):
+        inicio = time.perf_counter()
+        try:
+            resultado = funcao(palavra)
+        except Exception:
+            return None
+        quantidade = resultado if isinstance(resultado, int) else len(resultado)
+        if quantidade <= 3:
+            return None
+        return time.perf_counter() - inicio
+
+    fake_conceptnet.contadores(url, zerar=True)
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        for latencia in executor.map(chamar, palavras):
+            if latencia is None:
+                erros += 1
+            else:
+                latencias.append(latencia)
+    duracao = time.perf_counter() - inicio
+    servidor = fake_conceptnet.contadores(url)
+
+    return {
+        "p50": percentil(latencias, 50) if latencias else 0,
+        "p95": percentil(latencias, 95) if latencias else 0,
+        "p99": percentil(latencias, 99) if latencias else 0,
+        "vazao": chamadas / duracao,
+        "erros": erros,
+        "requisicoes": servidor["requisicoes"],
+        "bytes": servidor["bytes_enviados"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da busca de palavras contra a ConceptNet falsa")
+    parser.add_argument("--chamadas", type=int, default=60, help="buscas por medição")
+    parser.add_argument("--concorrencia", type=int, nargs="+", default=[1, 10, 30])
+    parser.add_argument("--latencia", type=float, default=0.2)
+    parser.add_argument("--variacao", type=float, default=0.05)
+    parser.add_argument("--taxa-erros", type=float, default=0.0)
+    parser.add_argument("--arestas", type=int, help="arestas por página (padrão: o limit pedido)")
+    parser.add_argument("--paginas", type=int, default=3)
+    parser.add_argument("--gravacoes", help="respostas gravadas com fake_conceptnet.py --gravar")
+    parser.add_argument("--mesma-palavra", action="store_true", help="todas as chamadas buscam a mesma palavra")
+    parser.add_argument("--variantes", nargs="+", choices=list(VARIANTES), default=list(VARIANTES))
+    args = parser.parse_args()
+
+    opcoes = ["--latencia", args.latencia, "--variacao", args.variacao, "--taxa-erros", args.taxa_erros,
+              "--paginas", args.paginas]
+    if args.arestas:
+        opcoes += ["--arestas", args.arestas]
+    if args.gravacoes:
+        opcoes += ["--gravacoes", args.gravacoes]
+    processo, url = fake_conceptnet.iniciar_processo(*opcoes)
+    busca_palavras.BASE_URL = url
+    busca_palavras.INDICE_ARQUIVO = ""
+
+    print(f"ConceptNet falsa em {url}: latência {args.latencia}s, erros {args.taxa_erros:.0%}")
+    print(f"{'variante':24} {'conc':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'busca/s':>8} {'erros':>5} {'req':>6} {'KiB':>8}")
+    try:
+        for nome in args.variantes:
+            for concorrencia in args.concorrencia:
+                r = medir(VARIANTES[nome], url, args.chamadas, concorrencia, args.mesma_palavra)
+                print(f"{nome:24} {concorrencia:>4} {r['p50'] * 1000:8.0f} {r['p95'] * 1000:8.0f} "
+                      f"{r['p99'] * 1000:8.0f} {r['vazao']:8.1f} {r['erros']:>5} {r['requisicoes']:>6} "
+                      f"{r['bytes'] / 1024:8.0f}")
+    finally:
+        processo.terminate()
+
+
+if __name__ == "__main__":
+    main()
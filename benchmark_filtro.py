@@ -0,0 +1,121 @@
+import argparse
+import json
+import random
+import time
+
+import requests
+
+from busca_palavras import BASE_URL, CATEGORIAS_INDESEJADAS, filtrar_edges
+
+# Micro-benchmark do filtro de arestas da busca de palavras.
+#
+#   python benchmark_filtro.py                        # payload sintético de 10 mil arestas
+#   python benchmark_filtro.py --payload gato.json    # payload gravado
+#   python benchmark_filtro.py --gravar gato gato.json
+#
+# Compara o filtro em lote de busca_palavras com o laço aresta a aresta usado
+# antes (com o erro de digitação "palabra_alvo" corrigido, senão ele nem roda)
+
+RAIZES = [
+    "gato", "felino", "animal", "bicho", "rato", "leite", "pelo", "miau", "casa", "cauda",
+    "bigode", "caça", "tigre", "leão", "doméstico", "pata", "unha", "sono", "noite", "telhado",
+]
+SUFIXOS = ["", "s", "inho", "ão", "eiro", " preto", " do mato", " selvagem", " de rua", " angorá"]
+ESTRANHOS = ["cor laranja", "número 7", "quantidade", "gato 2", "g@to", "ab", "x" * 30, "numeral", "color"]
+
+
+def gerar_payload(palavra="gato", total=10000, semente=42):
+    aleatorio = random.Random(semente)
+    edges = []
+    for _ in range(total):
+        if aleatorio.random() < 0.05:
+            rotulo = aleatorio.choice(ESTRANHOS)
+        else:
+            rotulo = aleatorio.choice(RAIZES) + aleatorio.choice(SUFIXOS)
+        if aleatorio.random() < 0.3:
+            rotulo = rotulo.capitalize()
+
+        outro = {"@id": "/c/pt/" + rotulo.lower().replace(" ", "_"), "label": rotulo}
+        buscado = {"@id": f"/c/pt/{palavra}/n", "label": palavra}
+        # Metade das arestas tem a palavra buscada no fim (o caso que o erro de digitação perdia)
+        if aleatorio.random() < 0.5:
+            edges.append({"start": buscado, "end": outro})
+        else:
+            edges.append({"start": outro, "end": buscado})
+    return {"edges": edges}
+
+
+# Grava as arestas reais de uma palavra seguindo a paginação da API
+def gravar_payload(palavra, arquivo, total=10000):
+    edges = []
+    url = f"{BASE_URL}/query?node=/c/pt/{palavra}&limit=1000"
+    while url and len(edges) < total:
+        data = requests.get(url, timeout=30).json()
+        edges.extend(data.get("edges", []))
+        proxima = data.get("view", {}).get("nextPage")
+        url = BASE_URL + proxima if proxima else None
+    with open(arquivo, "w", encoding="utf-8") as f:
+        json.dump({"edges": edges[:total]}, f, ensure_ascii=False)
+    print(f"{len(edges[:total])} arestas gravadas em {arquivo}")
+
+
+def filtro_anterior(edges, palavra, palavras_relacionadas):
+    for edge in edges:
+        if f"/c/pt/{palavra}" in edge["start"]["@id"]:
+            palavra_alvo = edge["end"]["label"].lower()
+        else:
+            palavra_alvo = edge["start"]["label"].lower()
+
+        if (palavra_alvo.replace(" ", "").isalpha() and
+            3 <= len(palavra_alvo) <= 25 and
+            not any(cat in palavra_alvo for cat in CATEGORIAS_INDESEJADAS) and
+            palavra_alvo not in palavras_relacionadas):
+
+            palavras_relacionadas.add(palavra_alvo)
+
+
+def medir(funcao, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do filtro de arestas da ConceptNet")
+    parser.add_argument("--payload", help="arquivo JSON com {\"edges\": [...]}")
+    parser.add_argument("--palavra", default="gato")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--gravar", nargs=2, metavar=("PALAVRA", "ARQUIVO"), help="grava um payload real e sai")
+    args = parser.parse_args()
+
+    if args.gravar:
+        gravar_payload(*args.gravar)
+        return
+
+    if args.payload:
+        with open(args.payload, encoding="utf-8") as f:
+            edges = json.load(f)["edges"]
+    else:
+        edges = gerar_payload(args.palavra)["edges"]
+
+    no = f"/c/pt/{args.palavra}"
+    anterior, atual = set(), set()
+    filtro_anterior(edges, args.palavra, anterior)
+    filtrar_edges(edges, no, atual)
+    if anterior != atual:
+        print(f"Aviso: resultados diferentes ({len(anterior ^ atual)} palavras)")
+
+    tempo_anterior = medir(lambda: filtro_anterior(edges, args.palavra, set()), args.repeticoes)
+    tempo_atual = medir(lambda: filtrar_edges(edges, no, set()), args.repeticoes)
+
+    print(f"{len(edges)} arestas, {len(atual)} palavras aceitas")
+    print(f"laço aresta a aresta: {tempo_anterior * 1000:8.2f} ms")
+    print(f"filtro em lote:       {tempo_atual * 1000:8.2f} ms")
+    print(f"aceleração:           {tempo_anterior / tempo_atual:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache_palavras import normalizar_palavra, obter_cache
+from chamada_unica import ChamadaUnica, TransmissaoUnica
+from dificuldade import selecionar_por_dificuldade
+from indice_conceptnet import IndiceConceptNet
+from metricas import METRICAS_ATIVAS, medir, registrar_requisicao
+
+BASE_URL = os.getenv("CONCEPTNET_URL", "http://api.conceptnet.io")
+
+# Tempo máximo (conexão, leitura) de cada requisição e prazo total da busca, em segundos
+TIMEOUT_REQUISICAO = (3, 5)
+PRAZO_TOTAL = 8
+
+# Índice local gerado por indice_conceptnet.py; se o arquivo existir, as buscas
+# são resolvidas nele e a API da ConceptNet não é consultada
+INDICE_ARQUIVO = os.getenv("INDICE_CONCEPTNET", "indice_conceptnet.db")
+
+# Tamanho máximo da lista de palavras relacionadas; quando a busca traz mais,
+# ficam palavras de toda a faixa de dificuldade (dificuldade.py)
+MAX_PALAVRAS = 100
+
+CATEGORIAS_INDESEJADAS = {"cor", "color", "número", "numero", "numeral", "quantidade"}
+# Uma única expressão para todas as categorias, compilada uma vez só
+_CATEGORIAS_INDESEJADAS_RE = re.compile("|".join(sorted(map(re.escape, CATEGORIAS_INDESEJADAS))))
+
+# Consultas feitas para cada palavra: (relação, arestas por página). Relação
+# None é o endpoint /c/pt/<palavra>, que traz as arestas de qualquer relação
+# (20 por página). Enquanto faltarem palavras, cada consulta segue até
+# MAX_PAGINAS_POR_CONSULTA páginas
+MAX_PAGINAS_POR_CONSULTA = 5
+CONSULTAS_PT = [
+    (None, 20),
+    ("/r/RelatedTo", 100),
+    ("/r/Synonym", 50),
+    ("/r/IsA", 50),
+    ("/r/PartOf", 50),
+]
+CONSULTAS_EN = [
+    ("/r/RelatedTo", 50),
+    ("/r/Synonym", 30),
+]
+
+# Sessão compartilhada: mantém as conexões com a ConceptNet abertas (keep-alive)
+# entre as buscas em vez de abrir uma conexão nova para cada endpoint
+_sessao = requests.Session()
+_sessao.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=64))
+_sessao.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=64))
+
+_executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="conceptnet")
+
+# Quando várias sessões buscam a mesma palavra ao mesmo tempo (uma turma
+# inteira digitando "escola"), só uma busca e uma requisição por endpoint
+# vão para a ConceptNet; as demais esperam o resultado delas
+_buscas = ChamadaUnica()
+_requisicoes = ChamadaUnica()
+# O mesmo para a busca em lotes do jogo: uma só busca por palavra, com os
+# lotes entregues a todas as sessões que esperam por ela
+_buscas_em_lotes = TransmissaoUnica("busca-lotes")
+
+
+_indice = None
+_indice_lock = threading.Lock()
+
+
+def obter_indice():
+    global _indice
+    with _indice_lock:
+        if _indice is None and os.path.exists(INDICE_ARQUIVO):
+            _indice = IndiceConceptNet(INDICE_ARQUIVO)
+        return _indice
+
+
+def _endpoints_pt(palavra):
+    return [
+        f"/c/pt/{palavra}" if rel is None else f"/query?node=/c/pt/{palavra}&rel={rel}&limit={limite}"
+        for rel, limite in CONSULTAS_PT
+    ]
+
+
+def _endpoints_en(palavra):
+    return [f"/query?node=/c/en/{palavra}&rel={rel}&limit={limite}" for rel, limite in CONSULTAS_EN]
+
+
+# Rótulo da consulta nas métricas: idioma e relação ("pt:RelatedTo", "pt:todas"),
+# o mesmo para todas as páginas e palavras
+def _consulta(endpoint):
+    idioma = re.search(r"/c/(\w+)/", endpoint)
+    relacao = re.search(r"rel=/r/(\w+)", endpoint)
+    return f"{idioma.group(1) if idioma else '?'}:{relacao.group(1) if relacao else 'todas'}"
+
+
+def _get(endpoint, timeout):
+    if not METRICAS_ATIVAS:
+        return _sessao.get(BASE_URL + endpoint, timeout=timeout)
+
+    inicio = time.perf_counter()
+    try:
+        response = _sessao.get(BASE_URL + endpoint, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        registrar_requisicao(_consulta(endpoint), type(e).__name__, time.perf_counter() - inicio)
+        raise
+    registrar_requisicao(_consulta(endpoint), response.status_code, time.perf_counter() - inicio)
+    return response
+
+
+def _requisitar(endpoint, timeout):
+    return _requisicoes.submeter(_executor, endpoint, _get, endpoint, timeout)
+
+
+def estatisticas_coalescencia():
+    return {"buscas": _buscas.estatisticas(), "buscas_em_lotes": _buscas_em_lotes.estatisticas(),
+            "requisicoes": _requisicoes.estatisticas()}
+
+
+def _restante(prazo):
+    return max(0, prazo - time.monotonic())
+
+
+# Filtro das arestas em lote: recebe todas as arestas de uma resposta e
+# devolve, na ordem em que aparecem, as palavras novas que passam nas regras
+# (só letras e espaços, de 3 a 25 caracteres, sem categorias indesejadas).
+# O peso da aresta mais forte de cada palavra nova vai para `pesos`, o dict
+# de pesos da lista que está sendo montada (usado pelo dificuldade.py)
+def filtrar_edges(edges, no, palavras_relacionadas, pesos=None):
+    # A palavra relacionada é sempre a ponta da aresta oposta ao nó buscado
+    # ("/c/pt/gato" ou "/c/pt/gato/n/...", mas não "/c/pt/gatorade")
+    prefixo = no + "/"
+    rotulos = {}
+    for edge in edges:
+        inicio = edge["start"]
+        ponta = edge["end"] if inicio["@id"] == no or inicio["@id"].startswith(prefixo) else inicio
+        rotulo = ponta["label"].lower()
+        peso = edge.get("weight", 0)
+        if peso > rotulos.get(rotulo, -1):
+            rotulos[rotulo] = peso
+
+    novas = [
+        rotulo for rotulo in rotulos
+        if 3 <= len(rotulo) <= 25
+        and rotulo not in palavras_relacionadas
+        and rotulo.replace(" ", "").isalpha()
+        and not _CATEGORIAS_INDESEJADAS_RE.search(rotulo)
+    ]
+    palavras_relacionadas.update(novas)
+    if pesos is not None:
+        pesos.update((rotulo, rotulos[rotulo]) for rotulo in novas if rotulos[rotulo])
+    return novas
+
+
+# Percorre as respostas das consultas já disparadas em `futuros`, na ordem em
+# que chegam, seguindo os links de paginação da API (view.nextPage). Cada
+# página é lida e entregue inteira antes de a próxima ser pedida, e nenhuma
+# página nova é pedida depois que continuar() devolve False. Erros e prazo
+# esgotado são anotados em `falhas`
+def _paginas(futuros, timeout, prazo, falhas, continuar):
+    pendentes = {futuro: 1 for futuro in futuros}
+    while pendentes and continuar():
+        prontos, _ = wait(pendentes, timeout=_restante(prazo), return_when=FIRST_COMPLETED)
+        if not prontos:
+            falhas.append(TimeoutError("prazo da busca esgotado"))
+            return
+
+        for futuro in prontos:
+            pagina = pendentes.pop(futuro)
+            try:
+                response = futuro.result()
+                response.raise_for_status()
+                data = response.json()
+            except requests.exceptions.RequestException as e:
+                falhas.append(e)
+                continue
+
+            yield data
+
+            proxima = data.get("view", {}).get("nextPage")
+            if proxima and pagina < MAX_PAGINAS_POR_CONSULTA and continuar():
+                pendentes[_requisitar(proxima, timeout)] = pagina + 1
+
+
+# Gera as palavras novas de cada página assim que ela chega, até juntar
+# `alvo` palavras. Erros não interrompem a geração: são anotados em `falhas`
+# para quem chamou, e os pesos das arestas de cada palavra, em `pesos`. Falhas
+# nas consultas em inglês, que são só um reforço, aparecem no log mas não
+# contam como falha da busca
+def _lotes_conceptnet(palavra, timeout, prazo_total, falhas, pesos, alvo=MAX_PALAVRAS):
+    prazo = time.monotonic() + prazo_total
+    termo = palavra.replace(" ", "_")
+    palavras_relacionadas = {palavra.lower(), palavra.upper(), palavra.capitalize()}
+    yield list(palavras_relacionadas)
+
+    def continuar():
+        return len(palavras_relacionadas) < alvo
+
+    # Dispara os endpoints em português de uma vez: a busca custa uma única ida
+    # e volta em vez da soma de todas. As requisições podem estar sendo
+    # compartilhadas com outras buscas, por isso não são canceladas quando esta
+    # busca termina antes delas
+    futuros_pt = [_requisitar(endpoint, timeout) for endpoint in _endpoints_pt(palavra)]
+
+    for data in _paginas(futuros_pt, timeout, prazo, falhas, continuar):
+        novas = filtrar_edges(data.get("edges", []), f"/c/pt/{termo}", palavras_relacionadas, pesos)
+        if novas:
+            yield novas
+
+    # Os de inglês só saem quando o português trouxe pouco: na maioria das
+    # buscas eles não são necessários, e dispará-los junto custaria banda e
+    # cota da ConceptNet para ser descartado
+    if falhas or len(palavras_relacionadas) >= 30:
+        return
+
+    futuros_en = [_requisitar(endpoint, timeout) for endpoint in _endpoints_en(palavra)]
+    falhas_en = []
+    for data in _paginas(futuros_en, timeout, prazo, falhas_en, continuar):
+        novas = filtrar_edges(data.get("edges", []), f"/c/en/{termo}", palavras_relacionadas, pesos)
+        if novas:
+            yield novas
+    for falha in falhas_en:
+        print(f"Erro nas buscas em inglês: {falha}")
+
+
+def _buscar_na_conceptnet(palavra, timeout, prazo_total):
+    falhas = []
+    pesos = {}
+    palavras = [p for lote in _lotes_conceptnet(palavra, timeout, prazo_total, falhas, pesos) for p in lote]
+    if falhas:
+        print(f"Erro ao buscar palavras: {falhas[0]}")
+        return []
+    return selecionar_por_dificuldade(palavras, MAX_PALAVRAS, pesos)
+
+
+def _buscar_no_indice(indice, palavra, pesos=None):
+    pesos = {} if pesos is None else pesos
+    palavras_relacionadas = {palavra.lower(), palavra.upper(), palavra.capitalize()}
+    termo = palavra.replace(" ", "_")
+
+    # Mesmo limite de arestas que a busca na API teria seguindo a paginação
+    for rel, limite in CONSULTAS_PT:
+        if len(palavras_relacionadas) >= MAX_PALAVRAS:
+            break
+        edges = indice.consultar(f"/c/pt/{termo}", rel, limite * MAX_PAGINAS_POR_CONSULTA)
+        filtrar_edges(edges, f"/c/pt/{termo}", palavras_relacionadas, pesos)
+
+    if len(palavras_relacionadas) < 30:
+        for rel, limite in CONSULTAS_EN:
+            edges = indice.consultar(f"/c/en/{termo}", rel, limite * MAX_PAGINAS_POR_CONSULTA)
+            filtrar_edges(edges, f"/c/en/{termo}", palavras_relacionadas, pesos)
+
+    return selecionar_por_dificuldade(palavras_relacionadas, MAX_PALAVRAS, pesos)
+
+
+def _buscar(palavra, timeout, prazo_total, usar_cache):
+    indice = obter_indice()
+    if indice is not None:
+        return _buscar_no_indice(indice, palavra)
+
+    if not usar_cache:
+        return _buscar_na_conceptnet(palavra, timeout, prazo_total)
+
+    cache = obter_cache()
+    palavras = cache.obter(palavra)
+    if palavras is not None:
+        return palavras
+
+    palavras = _buscar_na_conceptnet(palavra, timeout, prazo_total)
+    # Falhas (lista vazia) não vão para o cache, para que a próxima busca tente de novo
+    if palavras:
+        cache.guardar(palavra, palavras)
+    return palavras
+
+
+# Função de busca de palavras
+@medir("buscar_palavras_relacionadas")
+def buscar_palavras_relacionadas(palavra, timeout=TIMEOUT_REQUISICAO, prazo_total=PRAZO_TOTAL, usar_cache=True):
+    palavra = normalizar_palavra(palavra)
+    palavras = _buscas.executar((palavra, usar_cache), _buscar, palavra, timeout, prazo_total, usar_cache)
+    # Cada chamador recebe sua própria cópia da lista compartilhada
+    return list(palavras)
+
+
+# Busca em lotes na ConceptNet, compartilhada pelas sessões que buscam a mesma
+# palavra ao mesmo tempo: publica (lote, pesos das palavras do lote) e, no fim,
+# guarda o resultado no cache uma vez só
+def _produzir_lotes(publicar, palavra, timeout, prazo_total, usar_cache):
+    falhas = []
+    pesos = {}
+    todas = []
+    enviadas = 0
+    for lote in _lotes_conceptnet(palavra, timeout, prazo_total, falhas, pesos):
+        todas.extend(lote)
+        lote = lote[:MAX_PALAVRAS - enviadas]
+        if lote:
+            enviadas += len(lote)
+            publicar((lote, {p: pesos[p] for p in lote if p in pesos}))
+
+    if falhas:
+        # Resultado parcial: serve para a partida atual, mas não vai para o cache
+        print(f"Erro ao buscar palavras: {falhas[0]}")
+    elif usar_cache:
+        obter_cache().guardar(palavra, selecionar_por_dificuldade(todas, MAX_PALAVRAS, pesos))
+
+
+# Versão em lotes da busca: gera as palavras conforme cada endpoint responde,
+# para que o jogo possa começar antes de a busca terminar. Índice local e
+# cache respondem tudo em um único lote. Gera no máximo MAX_PALAVRAS palavras.
+# pesos: dict preenchido com o peso da aresta de cada palavra antes de o lote
+# dela sair (o cache só guarda a lista; nele as palavras ficam sem peso)
+def buscar_palavras_relacionadas_em_lotes(palavra, timeout=TIMEOUT_REQUISICAO, prazo_total=PRAZO_TOTAL, usar_cache=True,
+                                          pesos=None):
+    palavra = normalizar_palavra(palavra)
+    pesos = {} if pesos is None else pesos
+
+    indice = obter_indice()
+    if indice is not None:
+        yield _buscar_no_indice(indice, palavra, pesos)
+        return
+
+    if usar_cache:
+        palavras = obter_cache().obter(palavra)
+        if palavras is not None:
+            yield palavras
+            return
+
+    lotes = _buscas_em_lotes.assinar((palavra, usar_cache), _produzir_lotes, palavra, timeout, prazo_total, usar_cache)
+    for lote, pesos_lote in lotes:
+        pesos.update(pesos_lote)
+        # Cada chamador recebe sua própria cópia do lote compartilhado
+        yield list(lote)
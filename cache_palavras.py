@@ -0,0 +1,130 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+# Configuração do cache (pode ser alterada por variáveis de ambiente)
+CACHE_ARQUIVO = os.getenv("CACHE_PALAVRAS_ARQUIVO", "cache_palavras.db")
+CACHE_TTL = int(os.getenv("CACHE_PALAVRAS_TTL", 7 * 24 * 3600))
+CACHE_MAX_ENTRADAS = int(os.getenv("CACHE_PALAVRAS_MAX", 5000))
+
+
+def normalizar_palavra(palavra):
+    return unicodedata.normalize("NFC", palavra.strip().lower())
+
+
+# Cache em disco das palavras relacionadas, com validade (TTL) e descarte
+# das entradas usadas há mais tempo (LRU) quando passa do tamanho máximo
+class CachePalavras:
+    def __init__(self, arquivo=CACHE_ARQUIVO, ttl=CACHE_TTL, max_entradas=CACHE_MAX_ENTRADAS):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self.acertos = 0
+        self.falhas = 0
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(arquivo, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS palavras (
+                palavra TEXT NOT NULL,
+                idioma TEXT NOT NULL,
+                resultado TEXT NOT NULL,
+                criado_em REAL NOT NULL,
+                acessado_em REAL NOT NULL,
+                acessos INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (palavra, idioma)
+            )
+        """)
+        self._conexao.execute("CREATE INDEX IF NOT EXISTS palavras_acessado_em ON palavras (acessado_em)")
+        self._conexao.commit()
+
+    def obter(self, palavra, idioma="pt"):
+        chave = normalizar_palavra(palavra)
+        agora = time.time()
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT resultado, criado_em FROM palavras WHERE palavra = ? AND idioma = ?",
+                (chave, idioma)
+            ).fetchone()
+
+            # Entradas vencidas continuam na tabela até serem substituídas ou
+            # descartadas, para não perder a contagem de acessos da palavra
+            if linha is None or agora - linha[1] > self.ttl:
+                self.falhas += 1
+                return None
+
+            self._conexao.execute(
+                "UPDATE palavras SET acessado_em = ?, acessos = acessos + 1 WHERE palavra = ? AND idioma = ?",
+                (agora, chave, idioma)
+            )
+            self._conexao.commit()
+            self.acertos += 1
+            return json.loads(linha[0])
+
+    def guardar(self, palavra, resultado, idioma="pt"):
+        chave = normalizar_palavra(palavra)
+        agora = time.time()
+        with self._lock:
+            self._conexao.execute(
+                """
+                INSERT INTO palavras (palavra, idioma, resultado, criado_em, acessado_em, acessos)
+                VALUES (?, ?, ?, ?, ?, 1)
+                ON CONFLICT (palavra, idioma) DO UPDATE SET
+                    resultado = excluded.resultado,
+                    criado_em = excluded.criado_em,
+                    acessado_em = excluded.acessado_em,
+                    acessos = acessos + 1
+                """,
+                (chave, idioma, json.dumps(resultado, ensure_ascii=False), agora, agora)
+            )
+            self._descartar_excedentes()
+            self._conexao.commit()
+
+    # Indica se a palavra tem resultado válido no cache, sem contar como acesso
+    def contem(self, palavra, idioma="pt"):
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT criado_em FROM palavras WHERE palavra = ? AND idioma = ?",
+                (normalizar_palavra(palavra), idioma)
+            ).fetchone()
+        return linha is not None and time.time() - linha[0] <= self.ttl
+
+    # Palavras mais buscadas entre as usadas nos últimos `dias` dias
+    def mais_usadas(self, limite, dias=14, idioma="pt"):
+        desde = time.time() - dias * 24 * 3600
+        with self._lock:
+            linhas = self._conexao.execute(
+                "SELECT palavra FROM palavras WHERE idioma = ? AND acessado_em >= ? "
+                "ORDER BY acessos DESC LIMIT ?",
+                (idioma, desde, limite)
+            ).fetchall()
+        return [linha[0] for linha in linhas]
+
+    def _descartar_excedentes(self):
+        total = self._conexao.execute("SELECT COUNT(*) FROM palavras").fetchone()[0]
+        if total > self.max_entradas:
+            self._conexao.execute(
+                "DELETE FROM palavras WHERE rowid IN "
+                "(SELECT rowid FROM palavras ORDER BY acessado_em LIMIT ?)",
+                (total - self.max_entradas,)
+            )
+
+    def estatisticas(self):
+        with self._lock:
+            entradas = self._conexao.execute("SELECT COUNT(*) FROM palavras").fetchone()[0]
+        return {"acertos": self.acertos, "falhas": self.falhas, "entradas": entradas}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obter_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CachePalavras()
+        return _cache
@@ -0,0 +1,51 @@
+import os
+from collections import OrderedDict
+
+# Quantidade máxima de views guardadas por sessão (pode ser alterada por variável de ambiente).
+# O padrão é o número de rotas do app (início e os dois jogos), então por padrão
+# nada sai do cache e cada jogo continua de onde parou. Com 2, fica só o início e
+# o jogo atual: menos memória por sessão, mas trocar de jogo monta a view de novo
+CACHE_VIEWS_MAX = int(os.getenv("CACHE_VIEWS_MAX", 3))
+
+
+# Views já montadas de uma sessão, por rota. Voltar para uma rota reaproveita
+# a view (e o estado do jogo dentro dela) em vez de reconstruí-la; passando do
+# limite, sai a view usada há mais tempo
+class CacheViews:
+    def __init__(self, max_entradas=CACHE_VIEWS_MAX):
+        self.max_entradas = max_entradas
+        self._views = OrderedDict()
+
+    def obter(self, rota, construir):
+        view = self._views.get(rota)
+        if view is not None:
+            self._views.move_to_end(rota)
+            return view
+
+        view = construir()
+        # Páginas que redirecionam (ex.: jogo de letras sem palavras) não são guardadas
+        if view is not None:
+            self._views[rota] = view
+            while len(self._views) > self.max_entradas:
+                self._views.popitem(last=False)
+        return view
+
+    def remover(self, rota):
+        self._views.pop(rota, None)
+
+    def views(self):
+        return list(self._views.values())
+
+    def limpar(self):
+        self._views.clear()
+
+    def __len__(self):
+        return len(self._views)
+
+
+def obter_cache_views(page):
+    cache = page.session.get("cache_views")
+    if cache is None:
+        cache = CacheViews()
+        page.session.set("cache_views", cache)
+    return cache
@@ -0,0 +1,157 @@
+import threading
+from concurrent.futures import Future
+
+
+# Coalescência de chamadas ("single flight"): chamadas concorrentes com a
+# mesma chave compartilham uma única execução em andamento em vez de
+# repeti-la. Assim que a execução termina, a chave fica livre de novo
+class ChamadaUnica:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._em_andamento = {}
+        self.executadas = 0
+        self.deduplicadas = 0
+
+    def _registrar(self, chave):
+        # Devolve (futuro, lider): só o líder executa, os demais esperam o futuro dele
+        with self._lock:
+            futuro = self._em_andamento.get(chave)
+            if futuro is not None:
+                self.deduplicadas += 1
+                return futuro, False
+            futuro = Future()
+            self._em_andamento[chave] = futuro
+            self.executadas += 1
+            return futuro, True
+
+    def _liberar(self, chave, futuro):
+        with self._lock:
+            if self._em_andamento.get(chave) is futuro:
+                del self._em_andamento[chave]
+
+    # Executa funcao(*args) na thread de quem chamou, ou espera a execução
+    # que já estiver em andamento para a mesma chave
+    def executar(self, chave, funcao, *args):
+        futuro, lider = self._registrar(chave)
+        if not lider:
+            return futuro.result()
+
+        try:
+            resultado = funcao(*args)
+        except BaseException as e:
+            futuro.set_exception(e)
+            raise
+        else:
+            futuro.set_result(resultado)
+            return resultado
+        finally:
+            self._liberar(chave, futuro)
+
+    # Versão assíncrona: agenda funcao(*args) no executor e devolve o futuro,
+    # que é o mesmo para todas as chamadas concorrentes com a mesma chave
+    def submeter(self, executor, chave, funcao, *args):
+        with self._lock:
+            futuro = self._em_andamento.get(chave)
+            if futuro is not None:
+                self.deduplicadas += 1
+                return futuro
+            futuro = executor.submit(funcao, *args)
+            self._em_andamento[chave] = futuro
+            self.executadas += 1
+
+        futuro.add_done_callback(lambda f: self._liberar(chave, f))
+        return futuro
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "executadas": self.executadas,
+                "deduplicadas": self.deduplicadas,
+                "em_andamento": len(self._em_andamento),
+            }
+
+
+# Lotes publicados por uma execução compartilhada, na ordem em que saíram
+class _Transmissao:
+    __slots__ = ("lotes", "terminou", "erro", "_condicao")
+
+    def __init__(self):
+        self.lotes = []
+        self.terminou = False
+        self.erro = None
+        self._condicao = threading.Condition()
+
+    def publicar(self, lote):
+        with self._condicao:
+            self.lotes.append(lote)
+            self._condicao.notify_all()
+
+    def encerrar(self, erro=None):
+        with self._condicao:
+            self.terminou = True
+            self.erro = erro
+            self._condicao.notify_all()
+
+    # Todos os lotes, desde o primeiro, mesmo para quem chegou depois
+    def ler(self):
+        posicao = 0
+        while True:
+            with self._condicao:
+                while posicao == len(self.lotes) and not self.terminou:
+                    self._condicao.wait()
+                if posicao == len(self.lotes):
+                    if self.erro is not None:
+                        raise self.erro
+                    return
+                lote = self.lotes[posicao]
+            posicao += 1
+            yield lote
+
+
+# Coalescência de chamadas que geram resultados aos poucos: a primeira chamada
+# com a chave executa produzir(publicar, *args) em uma thread própria, e ela e
+# as chamadas concorrentes recebem um gerador com os lotes publicados. A
+# execução vai até o fim mesmo que alguém pare de ler. Assim que ela termina,
+# a chave fica livre de novo
+class TransmissaoUnica:
+    def __init__(self, nome="transmissao"):
+        self.nome = nome
+        self._lock = threading.Lock()
+        self._em_andamento = {}
+        self.executadas = 0
+        self.deduplicadas = 0
+
+    def assinar(self, chave, produzir, *args):
+        with self._lock:
+            transmissao = self._em_andamento.get(chave)
+            lider = transmissao is None
+            if lider:
+                transmissao = self._em_andamento[chave] = _Transmissao()
+                self.executadas += 1
+            else:
+                self.deduplicadas += 1
+
+        if lider:
+            threading.Thread(target=self._produzir, args=(chave, transmissao, produzir, args),
+                             name=self.nome, daemon=True).start()
+        return transmissao.ler()
+
+    def _produzir(self, chave, transmissao, produzir, args):
+        erro = None
+        try:
+            produzir(transmissao.publicar, *args)
+        except Exception as e:
+            erro = e
+        finally:
+            with self._lock:
+                if self._em_andamento.get(chave) is transmissao:
+                    del self._em_andamento[chave]
+            transmissao.encerrar(erro)
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "executadas": self.executadas,
+                "deduplicadas": self.deduplicadas,
+                "em_andamento": len(self._em_andamento),
+            }
@@ -0,0 +1,130 @@
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+
+# Gera os arquivos estáticos servidos pelo app a partir de assets_fonte/:
+#
+#   python construir_assets.py
+#   python construir_assets.py --largura 300
+#
+# - SVG: comentários e espaços entre as tags são removidos;
+# - PNG/JPEG/WebP: reduzidos para no máximo --largura pixels (o dobro do tamanho
+#   exibido, para telas de alta densidade) e recomprimidos; exige o pacote Pillow
+#   (pip install Pillow), sem ele a imagem é copiada como está;
+# - cada arquivo ganha o hash do conteúdo no nome (assets/img/logo.<hash>.svg),
+#   então pode ficar em cache no navegador para sempre: um conteúdo novo é
+#   sempre um nome novo;
+# - arquivos de texto ganham uma versão .gz pré-comprimida ao lado;
+# - assets/manifesto_assets.json liga o nome original ao nome gerado (veja recursos.py).
+#
+# Os arquivos gerados por versões anteriores que saíram do manifesto são apagados
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+PASTA_FONTE = os.path.join(PASTA, "assets_fonte")
+PASTA_ASSETS = os.path.join(PASTA, "assets")
+SUBPASTA_SAIDA = "img"
+ARQUIVO_MANIFESTO = "manifesto_assets.json"
+
+LARGURA_MAXIMA = 400
+TAMANHO_HASH = 10
+EXTENSOES_TEXTO = {".svg", ".css", ".js", ".json", ".txt"}
+EXTENSOES_IMAGEM = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG", ".webp": "WEBP"}
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+def minificar_svg(texto):
+    texto = re.sub(r"<\?xml.*?\?>", "", texto, flags=re.S)
+    texto = re.sub(r"<!--.*?-->", "", texto, flags=re.S)
+    texto = re.sub(r">\s+<", "><", texto)
+    texto = re.sub(r"\s{2,}", " ", texto)
+    return texto.strip()
+
+
+def redimensionar(dados, formato, largura):
+    if Image is None:
+        print("  Pillow não está instalado: imagem copiada sem redimensionar")
+        return dados
+    imagem = Image.open(io.BytesIO(dados))
+    if imagem.width > largura:
+        altura = round(imagem.height * largura / imagem.width)
+        imagem = imagem.resize((largura, altura), Image.LANCZOS)
+    saida = io.BytesIO()
+    opcoes = {"optimize": True}
+    if formato in ("JPEG", "WEBP"):
+        opcoes["quality"] = 85
+    imagem.save(saida, formato, **opcoes)
+    # A recompressão não pode deixar o arquivo maior que o original
+    return saida.getvalue() if len(saida.getvalue()) < len(dados) else dados
+
+
+def processar(caminho, largura):
+    extensao = os.path.splitext(caminho)[1].lower()
+    with open(caminho, "rb") as f:
+        dados = f.read()
+    if extensao == ".svg":
+        return minificar_svg(dados.decode("utf-8")).encode("utf-8")
+    if extensao in EXTENSOES_IMAGEM:
+        return redimensionar(dados, EXTENSOES_IMAGEM[extensao], largura)
+    return dados
+
+
+def nome_versionado(nome, dados):
+    base, extensao = os.path.splitext(nome)
+    return f"{base}.{hashlib.sha256(dados).hexdigest()[:TAMANHO_HASH]}{extensao}"
+
+
+def construir(fonte=PASTA_FONTE, assets=PASTA_ASSETS, largura=LARGURA_MAXIMA):
+    saida = os.path.join(assets, SUBPASTA_SAIDA)
+    os.makedirs(saida, exist_ok=True)
+    manifesto = {}
+    gerados = set()
+
+    for nome in sorted(os.listdir(fonte)):
+        caminho = os.path.join(fonte, nome)
+        if not os.path.isfile(caminho) or nome.startswith("."):
+            continue
+        original = os.path.getsize(caminho)
+        dados = processar(caminho, largura)
+        versionado = nome_versionado(nome, dados)
+        with open(os.path.join(saida, versionado), "wb") as f:
+            f.write(dados)
+        gerados.add(versionado)
+        manifesto[nome] = f"{SUBPASTA_SAIDA}/{versionado}"
+
+        comprimido = ""
+        if os.path.splitext(nome)[1].lower() in EXTENSOES_TEXTO:
+            # mtime=0: o mesmo conteúdo gera sempre o mesmo .gz
+            dados_gz = gzip.compress(dados, compresslevel=9, mtime=0)
+            with open(os.path.join(saida, versionado + ".gz"), "wb") as f:
+                f.write(dados_gz)
+            gerados.add(versionado + ".gz")
+            comprimido = f", {len(dados_gz)} bytes com gzip"
+        print(f"{nome}: {original} -> {len(dados)} bytes{comprimido} ({manifesto[nome]})")
+
+    for nome in os.listdir(saida):
+        if nome not in gerados:
+            os.remove(os.path.join(saida, nome))
+
+    with open(os.path.join(assets, ARQUIVO_MANIFESTO), "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    return manifesto
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera os arquivos estáticos do app em assets/")
+    parser.add_argument("--largura", type=int, default=LARGURA_MAXIMA, help="largura máxima das imagens, em pixels")
+    args = parser.parse_args()
+    construir(largura=args.largura)
+
+
+if __name__ == "__main__":
+    main()
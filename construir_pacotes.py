@@ -0,0 +1,165 @@
+import argparse
+import os
+import struct
+import unicodedata
+
+# Compila as listas de conteudo_fonte/ (um arquivo .tsv por tema) em um único
+# pacote binário, lido pelo conteudo.py sem carregar os temas para a memória:
+#
+#   python construir_pacotes.py
+#   python construir_pacotes.py --saida /tmp/conteudo.pac
+#
+# Cada linha de um tema é "figura<TAB>nome<TAB>categoria[<TAB>dificuldade]";
+# a figura (emoji) pode ficar vazia e a dificuldade (1 a 5), quando falta, é
+# calculada pelo nome. Linhas vazias e começadas por # são ignoradas.
+#
+# Formato do pacote (inteiros little-endian):
+#
+#   cabeçalho   "JGPC", versão (u16), quantidade de temas (u16)
+#   diretório   por tema: tamanho do nome (u16), nome, início (u64), tamanho (u32)
+#   temas       cada um começa em um múltiplo de TAMANHO_PAGINA, para que abrir
+#               um tema só traga para a memória as páginas dele:
+#     cabeçalho   itens (u32), categorias (u16), itens com figura (u32)
+#     itens       figura (u32 início, u16 tamanho), nome (u32, u16), categoria (u8), dificuldade (u8)
+#     categorias  nome (u32, u16), primeira posição (u32) e quantidade (u32) em "por categoria"
+#     por categoria   índices dos itens ordenados por categoria, dificuldade e nome
+#     por figura      índices dos itens com figura, ordenados pelos bytes da figura
+#     textos      figuras, nomes e categorias em UTF-8
+#
+# As posições de textos são relativas ao início do tema
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+PASTA_FONTE = os.path.join(PASTA, "conteudo_fonte")
+ARQUIVO_PACOTE = os.path.join(PASTA, "pacotes", "conteudo.pac")
+
+MAGICO = b"JGPC"
+VERSAO = 1
+TAMANHO_PAGINA = 4096
+DIFICULDADE_MIN, DIFICULDADE_MAX = 1, 5
+
+CABECALHO = struct.Struct("<4sHH")
+ENTRADA_DIRETORIO = struct.Struct("<QI")
+CABECALHO_TEMA = struct.Struct("<IHI")
+ITEM = struct.Struct("<IHIHBB")
+CATEGORIA = struct.Struct("<IHII")
+INDICE = struct.Struct("<I")
+
+DIGRAFOS = ("ch", "lh", "nh", "rr", "ss", "qu", "gu", "ç")
+
+
+# Dificuldade de um nome para quem está aprendendo a ler: cresce com o
+# tamanho, com acentos e dígrafos e com mais de uma palavra
+def dificuldade_padrao(nome):
+    texto = nome.lower()
+    dificuldade = 1 + (len(texto) > 4) + (len(texto) > 7)
+    sem_acento = unicodedata.normalize("NFD", texto).encode("ascii", "ignore").decode()
+    dificuldade += sem_acento != texto or any(digrafo in texto for digrafo in DIGRAFOS)
+    dificuldade += " " in texto
+    return min(dificuldade, DIFICULDADE_MAX)
+
+
+def ler_tema(caminho):
+    itens = []
+    with open(caminho, encoding="utf-8") as f:
+        for numero, linha in enumerate(f, 1):
+            linha = linha.rstrip("\n")
+            if not linha.strip() or linha.lstrip().startswith("#"):
+                continue
+            campos = linha.split("\t")
+            if len(campos) not in (3, 4) or not campos[1].strip():
+                raise ValueError(f"{caminho}:{numero}: esperado figura<TAB>nome<TAB>categoria[<TAB>dificuldade]")
+            figura, nome, categoria = (campo.strip() for campo in campos[:3])
+            dificuldade = int(campos[3]) if len(campos) == 4 else dificuldade_padrao(nome)
+            if not DIFICULDADE_MIN <= dificuldade <= DIFICULDADE_MAX:
+                raise ValueError(f"{caminho}:{numero}: dificuldade fora de {DIFICULDADE_MIN}-{DIFICULDADE_MAX}")
+            itens.append((figura, nome, categoria, dificuldade))
+    return itens
+
+
+def compilar_tema(itens):
+    categorias = sorted({categoria for _, _, categoria, _ in itens})
+    numero_categoria = {categoria: i for i, categoria in enumerate(categorias)}
+    if len(categorias) > 255:
+        raise ValueError("no máximo 255 categorias por tema")
+
+    por_categoria = sorted(range(len(itens)), key=lambda i: (numero_categoria[itens[i][2]], itens[i][3], itens[i][1]))
+    por_figura = sorted((i for i in range(len(itens)) if itens[i][0]), key=lambda i: itens[i][0].encode("utf-8"))
+    figuras = [itens[i][0] for i in por_figura]
+    if len(set(figuras)) != len(figuras):
+        raise ValueError("figura repetida no tema")
+
+    # Os textos vêm depois das tabelas, cujo tamanho já se sabe aqui
+    base = (CABECALHO_TEMA.size + ITEM.size * len(itens) + CATEGORIA.size * len(categorias)
+            + INDICE.size * (len(por_categoria) + len(por_figura)))
+    textos = bytearray()
+    posicoes = {}
+
+    def texto(valor):
+        dados = valor.encode("utf-8")
+        if dados not in posicoes:
+            posicoes[dados] = base + len(textos)
+            textos.extend(dados)
+        return posicoes[dados], len(dados)
+
+    dados = bytearray(CABECALHO_TEMA.pack(len(itens), len(categorias), len(por_figura)))
+    for figura, nome, categoria, dificuldade in itens:
+        dados += ITEM.pack(*texto(figura), *texto(nome), numero_categoria[categoria], dificuldade)
+
+    inicio = 0
+    for categoria in categorias:
+        quantidade = sum(1 for item in itens if item[2] == categoria)
+        dados += CATEGORIA.pack(*texto(categoria), inicio, quantidade)
+        inicio += quantidade
+
+    for indice in por_categoria + por_figura:
+        dados += INDICE.pack(indice)
+    return bytes(dados + textos)
+
+
+def _alinhar(tamanho):
+    return -tamanho % TAMANHO_PAGINA
+
+
+def construir(fonte=PASTA_FONTE, saida=ARQUIVO_PACOTE):
+    temas = []
+    for nome in sorted(os.listdir(fonte)):
+        if nome.endswith(".tsv"):
+            itens = ler_tema(os.path.join(fonte, nome))
+            temas.append((nome[:-len(".tsv")], compilar_tema(itens), len(itens)))
+
+    cabecalho = CABECALHO.pack(MAGICO, VERSAO, len(temas))
+    tamanho_diretorio = sum(2 + len(nome.encode("utf-8")) + ENTRADA_DIRETORIO.size for nome, _, _ in temas)
+    inicio = len(cabecalho) + tamanho_diretorio
+    inicio += _alinhar(inicio)
+
+    diretorio = bytearray()
+    for nome, dados, _ in temas:
+        nome_bytes = nome.encode("utf-8")
+        diretorio += struct.pack("<H", len(nome_bytes)) + nome_bytes + ENTRADA_DIRETORIO.pack(inicio, len(dados))
+        inicio += len(dados) + _alinhar(len(dados))
+
+    os.makedirs(os.path.dirname(saida), exist_ok=True)
+    temporario = saida + ".tmp"
+    with open(temporario, "wb") as f:
+        f.write(cabecalho + diretorio)
+        for _, dados, _ in temas:
+            f.write(b"\0" * _alinhar(f.tell()))
+            f.write(dados)
+    # Troca atômica: servidores já no ar continuam lendo o pacote antigo pelo mmap
+    os.replace(temporario, saida)
+
+    for nome, dados, quantidade in temas:
+        print(f"{nome}: {quantidade} itens, {len(dados)} bytes")
+    print(f"{saida}: {os.path.getsize(saida)} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila os temas de conteudo_fonte/ em um pacote binário")
+    parser.add_argument("--fonte", default=PASTA_FONTE)
+    parser.add_argument("--saida", default=ARQUIVO_PACOTE)
+    args = parser.parse_args()
+    construir(args.fonte, args.saida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from construir_pacotes import ARQUIVO_PACOTE, CABECALHO, CABECALHO_TEMA, CATEGORIA, ENTRADA_DIRETORIO, INDICE, ITEM, MAGICO, VERSAO
+
+# Pacote de conteúdo gerado pelo construir_pacotes.py (pode ser alterado por variável de ambiente)
+PACOTE_CONTEUDO = os.getenv("PACOTE_CONTEUDO", ARQUIVO_PACOTE)
+
+Item = namedtuple("Item", "figura nome categoria dificuldade")
+
+
+# Sequência de valores lida direto do pacote, para o bisect procurar sem montar listas
+class _Coluna:
+    __slots__ = ("_ler", "_tamanho")
+
+    def __init__(self, ler, tamanho):
+        self._ler = ler
+        self._tamanho = tamanho
+
+    def __getitem__(self, posicao):
+        return self._ler(posicao)
+
+    def __len__(self):
+        return self._tamanho
+
+
+# Um tema do pacote. Os itens são lidos do mmap só quando pedidos: abrir o
+# tema não cria um objeto por item e o sistema só traz para a memória as
+# páginas que forem lidas. Funciona como sequência (len, tema[i]), então
+# pode ir direto para um Baralho
+class Tema:
+    __slots__ = ("nome", "_dados", "_base", "_quantidade", "_itens", "_categorias", "_por_categoria", "_por_figura",
+                 "_quantidade_figuras", "_nomes_categorias", "_categorias_por_numero")
+
+    def __init__(self, nome, dados, base):
+        self.nome = nome
+        self._dados = dados
+        self._base = base
+        self._quantidade, quantidade_categorias, self._quantidade_figuras = CABECALHO_TEMA.unpack_from(dados, base)
+        self._itens = base + CABECALHO_TEMA.size
+        self._categorias = self._itens + ITEM.size * self._quantidade
+        self._por_categoria = self._categorias + CATEGORIA.size * quantidade_categorias
+        self._por_figura = self._por_categoria + INDICE.size * self._quantidade
+        # As categorias são poucas e usadas em toda consulta: só elas ficam em memória
+        self._nomes_categorias = {}
+        for numero in range(quantidade_categorias):
+            inicio, tamanho, primeiro, quantidade = CATEGORIA.unpack_from(self._dados, self._categorias + CATEGORIA.size * numero)
+            self._nomes_categorias[self._texto(inicio, tamanho)] = (numero, primeiro, quantidade)
+        self._categorias_por_numero = tuple(self._nomes_categorias)
+
+    def _texto(self, inicio, tamanho):
+        inicio += self._base
+        return self._dados[inicio:inicio + tamanho].decode("utf-8")
+
+    def _registro(self, indice):
+        return ITEM.unpack_from(self._dados, self._itens + ITEM.size * indice)
+
+    def _indice(self, tabela, posicao):
+        return INDICE.unpack_from(self._dados, tabela + INDICE.size * posicao)[0]
+
+    def __len__(self):
+        return self._quantidade
+
+    def __getitem__(self, indice):
+        if not 0 <= indice < self._quantidade:
+            raise IndexError(f"item {indice} fora do tema {self.nome}")
+        figura, tamanho_figura, nome, tamanho_nome, categoria, dificuldade = self._registro(indice)
+        return Item(self._texto(figura, tamanho_figura), self._texto(nome, tamanho_nome),
+                    self._categorias_por_numero[categoria], dificuldade)
+
+    def categorias(self):
+        return list(self._nomes_categorias)
+
+    # Índices dos itens de uma categoria (ou de todas) dentro da faixa de
+    # dificuldade. Dentro de cada categoria os itens estão ordenados por
+    # dificuldade, então a faixa sai de duas buscas binárias
+    def indices(self, categoria=None, dificuldade_min=1, dificuldade_max=5):
+        if categoria is None:
+            faixas = self._nomes_categorias.values()
+        elif categoria in self._nomes_categorias:
+            faixas = [self._nomes_categorias[categoria]]
+        else:
+            return []
+
+        indices = []
+        for _, primeiro, quantidade in faixas:
+            dificuldades = _Coluna(lambda p: self._registro(self._indice(self._por_categoria, primeiro + p))[5], quantidade)
+            inicio = bisect_left(dificuldades, dificuldade_min)
+            fim = bisect_right(dificuldades, dificuldade_max, lo=inicio)
+            indices.extend(self._indice(self._por_categoria, primeiro + p) for p in range(inicio, fim))
+        return indices
+
+    # Posição do item com a figura (emoji) dada, por busca binária no índice de figuras
+    def posicao(self, figura):
+        chave = figura.encode("utf-8")
+
+        def ler(posicao):
+            inicio, tamanho = self._registro(self._indice(self._por_figura, posicao))[:2]
+            inicio += self._base
+            return self._dados[inicio:inicio + tamanho]
+
+        figuras = _Coluna(ler, self._quantidade_figuras)
+        posicao = bisect_left(figuras, chave)
+        if posicao < len(figuras) and figuras[posicao] == chave:
+            return self._indice(self._por_figura, posicao)
+        return None
+
+    # Item com a figura (emoji) dada
+    def buscar(self, figura):
+        posicao = self.posicao(figura)
+        return None if posicao is None else self[posicao]
+
+
+# Arquivo de pacote aberto por mmap, somente leitura. Só o diretório de temas é
+# lido na abertura; cada tema é montado (e guardado) na primeira vez que é pedido
+class PacoteConteudo:
+    def __init__(self, caminho=PACOTE_CONTEUDO):
+        with open(caminho, "rb") as f:
+            self._dados = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, versao, quantidade = CABECALHO.unpack_from(self._dados, 0)
+        if magico != MAGICO or versao != VERSAO:
+            raise ValueError(f"{caminho} não é um pacote de conteúdo (versão {VERSAO})")
+
+        self._diretorio = {}
+        posicao = CABECALHO.size
+        for _ in range(quantidade):
+            (tamanho,) = struct.unpack_from("<H", self._dados, posicao)
+            nome = self._dados[posicao + 2:posicao + 2 + tamanho].decode("utf-8")
+            posicao += 2 + tamanho
+            self._diretorio[nome] = ENTRADA_DIRETORIO.unpack_from(self._dados, posicao)[0]
+            posicao += ENTRADA_DIRETORIO.size
+        self._temas = {}
+        self._lock = threading.Lock()
+
+    def temas(self):
+        return list(self._diretorio)
+
+    def tema(self, nome):
+        with self._lock:
+            tema = self._temas.get(nome)
+            if tema is None:
+                if nome not in self._diretorio:
+                    raise KeyError(f"tema {nome} não está no pacote (temas: {', '.join(self._diretorio)})")
+                tema = self._temas[nome] = Tema(nome, self._dados, self._diretorio[nome])
+            return tema
+
+
+_pacote = None
+_pacote_lock = threading.Lock()
+
+
+# Pacote compartilhado por todas as sessões do processo
+def obter_pacote():
+    global _pacote
+    with _pacote_lock:
+        if _pacote is None:
+            _pacote = PacoteConteudo()
+        return _pacote
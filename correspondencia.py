@@ -0,0 +1,160 @@
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+# Conferência das respostas digitadas: "leao" vale para "Leão", "pe de moleque"
+# para "Pé-de-moleque" e, conforme o tamanho do nome, alguns erros de digitação
+# também são aceitos ("cachoro", "pasaro").
+#
+# Os nomes do catálogo são normalizados uma vez (sem acentos, minúsculos, hífens
+# como espaço) e entram em um índice de vizinhança por remoção: cada nome é
+# guardado junto com todas as variações que saem dele removendo até N letras.
+# Dois textos a distância de edição ≤ N sempre têm uma variação em comum, então
+# a busca só gera as variações da resposta e procura cada uma no índice, sem
+# percorrer o catálogo. As variações ficam como hashes em um array ordenado
+# (12 bytes cada), não como strings em um dict
+
+# Erros de digitação aceitos conforme o tamanho do nome (sem espaços)
+DISTANCIAS = ((3, 0), (7, 1))
+DISTANCIA_MAXIMA = 2
+
+# nome: o nome do catálogo que a resposta encontrou; distancia: 0 quando é o
+# próprio nome (ignorando acentos e maiúsculas)
+Correspondencia = namedtuple("Correspondencia", "indice nome distancia")
+
+
+def _hash(texto):
+    return hash(texto) & 0xFFFFFFFFFFFFFFFF
+
+
+def normalizar(texto):
+    texto = unicodedata.normalize("NFKD", texto)
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).casefold()
+    return " ".join(texto.replace("-", " ").split())
+
+
+def distancia_aceita(chave):
+    tamanho = len(chave.replace(" ", ""))
+    for limite, distancia in DISTANCIAS:
+        if tamanho <= limite:
+            return distancia
+    return DISTANCIA_MAXIMA
+
+
+# Textos que saem de chave removendo até `distancia` caracteres (incluindo a própria chave)
+def remocoes(chave, distancia):
+    variacoes = {chave}
+    atuais = {chave}
+    for _ in range(distancia):
+        atuais = {texto[:i] + texto[i + 1:] for texto in atuais for i in range(len(texto))}
+        variacoes |= atuais
+    return variacoes
+
+
+# Distância de edição com transposição de letras vizinhas ("cachrro"), parando
+# assim que passa do limite; devolve limite + 1 nesse caso
+def distancia_edicao(a, b, limite):
+    if abs(len(a) - len(b)) > limite:
+        return limite + 1
+    anterior2 = None
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        atual = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            custo = a[i - 1] != b[j - 1]
+            atual[j] = min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + custo)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                atual[j] = min(atual[j], anterior2[j - 2] + 1)
+        if min(atual) > limite:
+            return limite + 1
+        anterior2, anterior = anterior, atual
+    return min(anterior[-1], limite + 1)
+
+
+# Índice das respostas de uma lista de itens (nomes ou Item do pacote de
+# conteúdo). A lista é lida uma vez, na criação
+class IndiceRespostas:
+    __slots__ = ("itens", "_chaves", "_por_chave", "_indices", "_tabelas")
+
+    def __init__(self, itens):
+        self.itens = itens
+        self._chaves = []
+        self._por_chave = {}
+        # Itens de cada chave: nomes que só mudam nos acentos viram a mesma chave
+        self._indices = []
+        for indice in range(len(itens)):
+            item = itens[indice]
+            chave = normalizar(getattr(item, "nome", item))
+            numero = self._por_chave.get(chave)
+            if numero is None:
+                numero = self._por_chave[chave] = len(self._chaves)
+                self._chaves.append(chave)
+                self._indices.append([])
+            self._indices[numero].append(indice)
+
+        # Uma tabela por distância aceita: a resposta só é comparada com as
+        # variações de nomes do tamanho certo, removendo dela no máximo as letras
+        # que esses nomes aceitam. Sem isso, as variações curtas da resposta
+        # ("gt", de "gato") coincidem com as de metade do catálogo
+        self._tabelas = []
+        for distancia in range(DISTANCIA_MAXIMA + 1):
+            numeros = [numero for numero, chave in enumerate(self._chaves) if distancia_aceita(chave) == distancia]
+            if not numeros:
+                continue
+            tamanhos = [len(self._chaves[numero]) for numero in numeros]
+            # Hash e número da chave em um só inteiro: ordenar inteiros é bem mais rápido que ordenar tuplas
+            pares = sorted(_hash(variacao) << 32 | numero for numero in numeros
+                           for variacao in remocoes(self._chaves[numero], distancia))
+            self._tabelas.append((distancia, min(tamanhos) - distancia, max(tamanhos) + distancia,
+                                  array("Q", (par >> 32 for par in pares)), array("I", (par & 0xFFFFFFFF for par in pares))))
+
+    # Nomes do catálogo que a resposta pode ser, do mais próximo ao mais distante
+    def procurar(self, resposta):
+        chave = normalizar(resposta)
+        if not chave:
+            return []
+        numero = self._por_chave.get(chave)
+        if numero is not None:
+            return self._correspondencias(numero, 0)
+
+        candidatos = set()
+        for distancia, menor, maior, hashes, numeros in self._tabelas:
+            if not menor <= len(chave) <= maior:
+                continue
+            for variacao in remocoes(chave, distancia):
+                h = _hash(variacao)
+                inicio = bisect_left(hashes, h)
+                candidatos.update(numeros[inicio:bisect_right(hashes, h, lo=inicio)])
+
+        encontrados = []
+        for numero in candidatos:
+            limite = distancia_aceita(self._chaves[numero])
+            distancia = distancia_edicao(chave, self._chaves[numero], limite)
+            if distancia <= limite:
+                encontrados.append((distancia, numero))
+        return [c for distancia, numero in sorted(encontrados) for c in self._correspondencias(numero, distancia)]
+
+    def _correspondencias(self, numero, distancia):
+        return [Correspondencia(indice, getattr(self.itens[indice], "nome", self.itens[indice]), distancia)
+                for indice in self._indices[numero]]
+
+    # A correspondência da resposta com o item esperado, ou None se a resposta
+    # não for ele (nesse caso procurar diz com qual outro item ela se parece)
+    def conferir(self, resposta, indice):
+        return next((c for c in self.procurar(resposta) if c.indice == indice), None)
+
+
+_indices = {}
+_indices_lock = threading.Lock()
+
+
+# Índice compartilhado de um catálogo do pacote de conteúdo, calculado uma vez por processo
+def indice_respostas(catalogo):
+    with _indices_lock:
+        # O índice guarda o catálogo, então o id não é reaproveitado por outro objeto
+        indice = _indices.get(id(catalogo))
+        if indice is None:
+            indice = _indices[id(catalogo)] = IndiceRespostas(catalogo)
+        return indice
@@ -0,0 +1,191 @@
+import math
+import os
+import random
+from bisect import bisect_left, insort
+from collections import deque
+
+from indice_letras import letra_base
+
+# Dificuldade das palavras do jogo de letras, de 0 (fácil) a 1 (difícil), e a
+# escolha da próxima palavra conforme o desempenho da criança.
+#
+# Cada palavra recebe uma pontuação uma vez, quando entra na lista, pela soma
+# ponderada (PESOS_DIFICULDADE) de:
+#   tamanho    número de letras (3 ou menos = 0, 12 ou mais = 1)
+#   raridade   média da raridade das letras no português (K, W, Y, X, J, Z são raras)
+#   repetidas  letras que aparecem mais de uma vez (o jogador precisa achar a certa)
+#   acentos    acento ou cedilha em alguma letra
+#   relacao    o contrário da força da relação com a palavra buscada na ConceptNet:
+#              palavras muito ligadas ao tema costumam ser as mais conhecidas
+
+PESOS_DIFICULDADE = {"tamanho": 0.35, "raridade": 0.2, "repetidas": 0.1, "acentos": 0.15, "relacao": 0.2}
+
+# Frequência das letras no português, em %
+FREQUENCIAS = {
+    "a": 14.6, "e": 12.6, "o": 10.7, "s": 7.8, "r": 6.5, "i": 6.2, "n": 5.0, "d": 5.0, "m": 4.7,
+    "u": 4.6, "t": 4.3, "c": 3.9, "l": 2.8, "p": 2.5, "v": 1.7, "g": 1.3, "h": 1.3, "q": 1.2,
+    "b": 1.0, "f": 1.0, "z": 0.5, "j": 0.4, "x": 0.2, "w": 0.04, "k": 0.02, "y": 0.01,
+}
+_MAIS_FREQUENTE, _MENOS_FREQUENTE = max(FREQUENCIAS.values()), min(FREQUENCIAS.values())
+RARIDADE = {letra: math.log(_MAIS_FREQUENTE / frequencia) / math.log(_MAIS_FREQUENTE / _MENOS_FREQUENTE)
+            for letra, frequencia in FREQUENCIAS.items()}
+
+# Peso de aresta da ConceptNet a partir do qual a relação conta como a mais forte
+# (a maioria das arestas tem peso 1); palavras sem peso conhecido contam como 1.
+# Os pesos vêm da busca que trouxe a lista (busca_palavras.py), em um dict
+# {palavra: peso} que acompanha a lista: a mesma palavra pode ter pesos
+# diferentes conforme a palavra buscada
+PESO_FORTE = 4
+PESO_PADRAO = 1.0
+
+# Adaptação: a dificuldade alvo começa em ALVO_INICIAL e, a cada palavra nova,
+# sobe ou desce PASSO_ALVO conforme a taxa de acerto dos últimos cliques
+ALVO_INICIAL = float(os.getenv("DIFICULDADE_INICIAL", 0.3))
+PASSO_ALVO = 0.08
+CLIQUES_AVALIADOS = 12
+TAXA_SUBIR = 0.9
+TAXA_DESCER = 0.7
+# Palavras mais próximas do alvo entre as quais a próxima é sorteada
+CANDIDATOS = 3
+
+
+def pontuar(palavra, peso=PESO_PADRAO):
+    letras = [letra_base(c) for c in palavra if c.isalpha()]
+    if not letras:
+        return 0.0
+    componentes = {
+        "tamanho": min(max(len(letras) - 3, 0) / 9, 1),
+        "raridade": sum(RARIDADE.get(letra, 1) for letra in letras) / len(letras),
+        "repetidas": min(2 * (len(letras) - len(set(letras))) / len(letras), 1),
+        "acentos": float(any(not c.isascii() for c in palavra if c.isalpha())),
+        "relacao": 1 - min(peso, PESO_FORTE) / PESO_FORTE,
+    }
+    return sum(PESOS_DIFICULDADE[nome] * valor for nome, valor in componentes.items())
+
+
+def ordenar_por_dificuldade(palavras, pesos=None):
+    pesos = pesos or {}
+    return sorted(palavras, key=lambda palavra: pontuar(palavra, pesos.get(palavra, PESO_PADRAO)))
+
+
+# Até `limite` palavras, da mais fácil à mais difícil, espalhadas por toda a
+# faixa de dificuldade: cortar a lista ordenada deixaria só as fáceis, e o
+# alvo do SeletorPalavras não teria para onde subir
+def selecionar_por_dificuldade(palavras, limite, pesos=None):
+    ordenadas = ordenar_por_dificuldade(palavras, pesos)
+    if len(ordenadas) <= limite:
+        return ordenadas
+    if limite <= 1:
+        return ordenadas[:limite]
+    passo = (len(ordenadas) - 1) / (limite - 1)
+    return [ordenadas[round(i * passo)] for i in range(limite)]
+
+
+# Escolha das palavras do jogo de letras, no lugar do Baralho (mesma interface:
+# tirar, estado, restaurar e aleatorio). As palavras que ainda não saíram ficam
+# ordenadas pela pontuação, então as mais próximas do alvo são achadas por busca
+# binária (O(log n)). Tirar a sorteada da lista (e incluir as que chegam) é
+# O(n), por mover o resto da lista, mas é uma cópia de memória contínua,
+# rápida para as ~100 palavras de uma busca. Nenhuma palavra se repete até
+# todas terem saído. Como o Baralho, não copia a lista: palavras que a busca ainda está
+# trazendo são pontuadas e entram na ordem quando chegam. pesos: {palavra: peso}
+# da busca que trouxe a lista, preenchido por ela junto com a lista
+class SeletorPalavras:
+    __slots__ = ("itens", "pesos", "aleatorio", "alvo", "_pontuacoes", "_restantes", "_vistas", "_ultimo", "_cliques")
+
+    def __init__(self, itens, semente=None, aleatorio=None, pesos=None):
+        self.itens = itens
+        self.pesos = {} if pesos is None else pesos
+        self.aleatorio = aleatorio or random.Random(semente)
+        self.alvo = ALVO_INICIAL
+        self._pontuacoes = []
+        # (pontuação, índice) das palavras que ainda não saíram nesta volta, em
+        # ordem crescente: cada palavra sorteada sai da lista
+        self._restantes = []
+        self._vistas = set()
+        self._ultimo = None
+        self._cliques = deque(maxlen=CLIQUES_AVALIADOS)
+
+    def _incluir_novos(self):
+        while len(self._pontuacoes) < len(self.itens):
+            indice = len(self._pontuacoes)
+            palavra = self.itens[indice]
+            pontuacao = pontuar(palavra, self.pesos.get(palavra, PESO_PADRAO))
+            self._pontuacoes.append(pontuacao)
+            if indice not in self._vistas:
+                insort(self._restantes, (pontuacao, indice))
+
+    # Monta de novo a lista das que faltam sair; custa O(n log n), uma vez por volta
+    def _reconstruir(self):
+        self._restantes = sorted((pontuacao, indice) for indice, pontuacao in enumerate(self._pontuacoes)
+                                 if indice not in self._vistas)
+
+    # Clique da criança no jogo: certo (True) ou errado (False)
+    def registrar(self, acerto):
+        self._cliques.append(bool(acerto))
+
+    def _ajustar_alvo(self):
+        if len(self._cliques) < CLIQUES_AVALIADOS:
+            return
+        taxa = sum(self._cliques) / len(self._cliques)
+        if taxa >= TAXA_SUBIR:
+            self.alvo = min(self.alvo + PASSO_ALVO, 1.0)
+        elif taxa < TAXA_DESCER:
+            self.alvo = max(self.alvo - PASSO_ALVO, 0.0)
+        else:
+            return
+        # O novo alvo é avaliado só com os cliques feitos a partir dele
+        self._cliques.clear()
+
+    def tirar(self):
+        return self.itens[self.tirar_indice()]
+
+    def tirar_indice(self):
+        if not self.itens:
+            raise IndexError("baralho vazio")
+        self._incluir_novos()
+        self._ajustar_alvo()
+        if not self._restantes:
+            # Todas já saíram: começa outra volta
+            self._vistas = set()
+            self._reconstruir()
+
+        # As CANDIDATOS palavras mais próximas do alvo estão entre as CANDIDATOS
+        # de cada lado da posição dele. No começo de uma volta a última palavra
+        # sorteada está de novo na lista: ela não sai logo em seguida
+        restantes = self._restantes
+        posicao = bisect_left(restantes, (self.alvo, -1))
+        vizinhas = restantes[max(posicao - CANDIDATOS - 1, 0):posicao + CANDIDATOS + 1]
+        vizinhas = [par for par in vizinhas if par[1] != self._ultimo] or vizinhas
+        candidatos = sorted(vizinhas, key=lambda par: abs(par[0] - self.alvo))[:CANDIDATOS]
+
+        escolhida = self.aleatorio.choice(candidatos)
+        del restantes[bisect_left(restantes, escolhida)]
+        indice = escolhida[1]
+        self._vistas.add(indice)
+        self._ultimo = indice
+        return indice
+
+    # Alvo, cliques e palavras já vistas, para continuar em outra sessão ou servidor
+    def estado(self):
+        return {"alvo": self.alvo, "cliques": [int(c) for c in self._cliques],
+                "vistas": sorted(self._vistas), "ultimo": self._ultimo}
+
+    # Só aceita o estado de um seletor da mesma lista (ou de uma parte inicial
+    # dela); devolve False e mantém o seletor como está se não for
+    def restaurar(self, estado):
+        alvo = estado.get("alvo")
+        vistas = estado.get("vistas", [])
+        if not isinstance(alvo, (int, float)) or not 0 <= alvo <= 1 or any(not 0 <= v < len(self.itens) for v in vistas):
+            return False
+        self.alvo = float(alvo)
+        self._vistas = set(vistas)
+        self._ultimo = estado.get("ultimo")
+        self._cliques.clear()
+        self._cliques.extend(bool(c) for c in estado.get("cliques", []))
+        self._incluir_novos()
+        self._reconstruir()
+        return True
+
+    def __len__(self):
+        return len(self.itens)
@@ -0,0 +1,203 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+# Onde fica o estado dos jogadores (pode ser alterado por variáveis de ambiente):
+#   memoria               dentro do processo (um servidor só)
+#   sqlite:arquivo.db     arquivo compartilhado pelos servidores da mesma máquina
+#   redis://host:6379/0   Redis ou compatível (KeyDB, Valkey...); exige o pacote redis
+ESTADO_SESSAO = os.getenv("ESTADO_SESSAO", "memoria")
+ESTADO_TTL = int(os.getenv("ESTADO_SESSAO_TTL", 24 * 3600))
+ESTADO_MAX_JOGADORES = int(os.getenv("ESTADO_SESSAO_MAX", 10000))
+# Intervalo, em segundos, entre as limpezas dos jogadores vencidos no SQLite
+ESTADO_LIMPEZA = int(os.getenv("ESTADO_SESSAO_LIMPEZA", 60))
+
+# Chave no armazenamento do navegador que identifica o jogador entre conexões
+CHAVE_ID_JOGADOR = "jogos.id_jogador"
+
+
+# Em todos os backends o estado de um jogador vale por ESTADO_TTL desde a última
+# gravação e é apagado depois disso: ele continua disponível para o jogador
+# voltar por outra conexão, mas as sessões encerradas não se acumulam.
+# carregar cria o estado vazio de um jogador novo de forma atômica, então duas
+# conexões do mesmo jogador abertas juntas partem do mesmo registro
+
+# Estado guardado no próprio processo, com descarte dos jogadores inativos há mais tempo
+class EstadoMemoria:
+    def __init__(self, ttl=ESTADO_TTL, max_jogadores=ESTADO_MAX_JOGADORES):
+        self.ttl = ttl
+        self.max_jogadores = max_jogadores
+        self._dados = OrderedDict()
+        self._lock = threading.Lock()
+
+    def carregar(self, id_jogador):
+        with self._lock:
+            entrada = self._dados.get(id_jogador)
+            if entrada is None or time.time() - entrada[1] > self.ttl:
+                self._guardar(id_jogador, "{}")
+                return {}
+            return json.loads(entrada[0])
+
+    def salvar(self, id_jogador, dados):
+        # Guardado como JSON, como nos outros backends, para não compartilhar listas com os jogos
+        with self._lock:
+            self._guardar(id_jogador, json.dumps(dados, ensure_ascii=False))
+
+    def _guardar(self, id_jogador, texto):
+        self._dados[id_jogador] = (texto, time.time())
+        self._dados.move_to_end(id_jogador)
+        while len(self._dados) > self.max_jogadores:
+            self._dados.popitem(last=False)
+
+
+# Estado em um arquivo SQLite (WAL), que vários processos podem abrir ao mesmo tempo
+class EstadoSQLite:
+    def __init__(self, arquivo, ttl=ESTADO_TTL, max_jogadores=ESTADO_MAX_JOGADORES):
+        self.ttl = ttl
+        self.max_jogadores = max_jogadores
+        self._proxima_limpeza = 0
+        self._lock = threading.Lock()
+        self._conexao = sqlite3.connect(arquivo, check_same_thread=False, timeout=10)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.execute("""
+            CREATE TABLE IF NOT EXISTS estado (
+                id_jogador TEXT PRIMARY KEY,
+                dados TEXT NOT NULL,
+                atualizado_em REAL NOT NULL
+            )
+        """)
+        self._conexao.execute("CREATE INDEX IF NOT EXISTS estado_atualizado_em ON estado (atualizado_em)")
+        self._conexao.commit()
+
+    def carregar(self, id_jogador):
+        agora = time.time()
+        with self._lock:
+            # Na mesma transação: troca o registro vencido por um vazio e lê o
+            # que ficou (o vazio, ou o que outro processo acabou de criar)
+            self._conexao.execute("DELETE FROM estado WHERE id_jogador = ? AND atualizado_em < ?",
+                                  (id_jogador, agora - self.ttl))
+            self._conexao.execute("INSERT OR IGNORE INTO estado (id_jogador, dados, atualizado_em) VALUES (?, '{}', ?)",
+                                  (id_jogador, agora))
+            linha = self._conexao.execute("SELECT dados FROM estado WHERE id_jogador = ?", (id_jogador,)).fetchone()
+            self._limpar(agora)
+            self._conexao.commit()
+        return json.loads(linha[0])
+
+    def salvar(self, id_jogador, dados):
+        agora = time.time()
+        with self._lock:
+            self._conexao.execute(
+                "INSERT INTO estado (id_jogador, dados, atualizado_em) VALUES (?, ?, ?) "
+                "ON CONFLICT (id_jogador) DO UPDATE SET dados = excluded.dados, atualizado_em = excluded.atualizado_em",
+                (id_jogador, json.dumps(dados, ensure_ascii=False), agora)
+            )
+            self._limpar(agora)
+            self._conexao.commit()
+
+    # A cada ESTADO_LIMPEZA segundos apaga os jogadores vencidos e, passando de
+    # max_jogadores, os que gravaram há mais tempo
+    def _limpar(self, agora):
+        if agora < self._proxima_limpeza:
+            return
+        self._proxima_limpeza = agora + ESTADO_LIMPEZA
+        self._conexao.execute("DELETE FROM estado WHERE atualizado_em < ?", (agora - self.ttl,))
+        total = self._conexao.execute("SELECT COUNT(*) FROM estado").fetchone()[0]
+        if total > self.max_jogadores:
+            self._conexao.execute(
+                "DELETE FROM estado WHERE rowid IN (SELECT rowid FROM estado ORDER BY atualizado_em LIMIT ?)",
+                (total - self.max_jogadores,)
+            )
+
+
+# Estado em um servidor Redis (ou compatível), com validade pela própria expiração das chaves
+class EstadoRedis:
+    def __init__(self, url, ttl=ESTADO_TTL):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("ESTADO_SESSAO com redis:// exige o pacote redis (pip install redis)")
+        self.ttl = ttl
+        self._redis = redis.Redis.from_url(url)
+
+    def _chave(self, id_jogador):
+        return f"jogos:estado:{id_jogador}"
+
+    def carregar(self, id_jogador):
+        chave = self._chave(id_jogador)
+        # SET NX: só cria o estado vazio se nenhuma conexão do jogador criou antes
+        self._redis.set(chave, "{}", ex=self.ttl, nx=True)
+        dados = self._redis.get(chave)
+        return json.loads(dados) if dados else {}
+
+    def salvar(self, id_jogador, dados):
+        self._redis.set(self._chave(id_jogador), json.dumps(dados, ensure_ascii=False), ex=self.ttl)
+
+
+def criar_backend(configuracao=ESTADO_SESSAO):
+    if configuracao == "memoria":
+        return EstadoMemoria()
+    if configuracao.startswith("sqlite:"):
+        return EstadoSQLite(configuracao[len("sqlite:"):] or "estado_sessoes.db")
+    if configuracao.startswith(("redis://", "rediss://", "unix://")):
+        return EstadoRedis(configuracao)
+    raise ValueError(f"ESTADO_SESSAO inválido: {configuracao}")
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def obter_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = criar_backend()
+        return _backend
+
+
+# Estado de um jogador: lido uma vez quando a sessão começa e gravado a cada
+# mudança. Um jogador só está ligado a um servidor por vez, então a cópia local
+# não fica desatualizada
+class EstadoJogador:
+    __slots__ = ("id_jogador", "_backend", "_dados")
+
+    def __init__(self, backend, id_jogador):
+        self.id_jogador = id_jogador
+        self._backend = backend
+        self._dados = backend.carregar(id_jogador)
+
+    def obter(self, campo, padrao=None):
+        return self._dados.get(campo, padrao)
+
+    def atualizar(self, **campos):
+        self._dados.update(campos)
+        self._backend.salvar(self.id_jogador, self._dados)
+
+
+# Identifica o jogador pelo armazenamento do navegador, que continua o mesmo
+# quando a conexão cai e volta em outro servidor. Chamado no início da sessão
+def identificar_jogador(page):
+    try:
+        id_jogador = page.client_storage.get(CHAVE_ID_JOGADOR)
+        if not id_jogador:
+            id_jogador = uuid.uuid4().hex
+            page.client_storage.set(CHAVE_ID_JOGADOR, id_jogador)
+    except Exception as e:
+        print(f"Não foi possível ler o id do jogador no navegador: {e}")
+        id_jogador = page.session_id
+    page.session.set("id_jogador", id_jogador)
+    return id_jogador
+
+
+def obter_estado_jogador(page):
+    estado = page.session.get("estado_jogador")
+    if estado is None:
+        id_jogador = page.session.get("id_jogador") or page.session_id
+        estado = EstadoJogador(obter_backend(), id_jogador)
+        page.session.set("estado_jogador", estado)
+    return estado
@@ -0,0 +1,75 @@
+from functools import lru_cache
+
+import flet as ft
+
+# Cores do tema
+COLOR_PRIMARY = "#5E35B1"
+COLOR_SECONDARY = "#3949AB"
+COLOR_ACCENT = "#FFC107"
+COLOR_BACKGROUND = "#F5F5F5"
+COLOR_TEXT = "#212121"
+
+# Objetos de estilo compartilhados por todas as views e sessões (não devem ser alterados)
+SOMBRA_CARTAO = ft.BoxShadow(
+    spread_radius=1,
+    blur_radius=15,
+    color=ft.colors.with_opacity(0.1, ft.colors.BLACK),
+    offset=ft.Offset(0, 0),
+    blur_style=ft.ShadowBlurStyle.NORMAL,
+)
+ANIMACAO_RAPIDA = ft.animation.Animation(300, ft.AnimationCurve.EASE_IN_OUT)
+ANIMACAO_LENTA = ft.animation.Animation(500, ft.AnimationCurve.EASE_IN_OUT)
+
+
+# Componente de cabeçalho
+def header(title):
+    return ft.Container(
+        content=ft.Text(
+            title,
+            size=28,
+            weight=ft.FontWeight.BOLD,
+            color=ft.colors.WHITE,
+            text_align=ft.TextAlign.CENTER
+        ),
+        padding=20,
+        bgcolor=COLOR_PRIMARY,
+        border_radius=ft.border_radius.only(top_left=10, top_right=10),
+        width=800
+    )
+
+
+# Um estilo por cor de botão, reaproveitado entre os botões
+@lru_cache(maxsize=None)
+def estilo_botao(bgcolor):
+    return ft.ButtonStyle(
+        bgcolor=bgcolor,
+        color=ft.colors.WHITE,
+        shape=ft.RoundedRectangleBorder(radius=10),
+        padding=20,
+        elevation=8,
+        overlay_color=ft.colors.with_opacity(0.1, ft.colors.WHITE)
+    )
+
+
+# Botão personalizado
+def styled_button(text, on_click, icon=None, width=200, bgcolor=COLOR_SECONDARY):
+    return ft.ElevatedButton(
+        text=text,
+        icon=icon,
+        on_click=on_click,
+        width=width,
+        height=50,
+        style=estilo_botao(bgcolor),
+    )
+
+
+# Cartão branco com sombra onde fica o conteúdo de cada página
+def cartao(conteudo):
+    return ft.Container(
+        content=conteudo,
+        padding=30,
+        bgcolor=ft.colors.WHITE,
+        border_radius=10,
+        width=800,
+        shadow=SOMBRA_CARTAO
+    )
@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import flet as ft
+
+import jogos
+from agendador import obter_agendador
+from medir_memoria import ConexaoFalsa
+
+# Teste de estresse do autoavanço do jogo de figuras: várias sessões, cada uma
+# recebendo rajadas de Enter com a resposta certa ao mesmo tempo (como os
+# handlers do Flet, em threads), e depois uma desconexão no meio da contagem.
+#
+#   python estresse_autoavanco.py
+#   python estresse_autoavanco.py --sessoes 100 --rajada 30 --rodadas 5
+#
+# Em cada rodada cada sessão deve contar um acerto, rodar uma contagem e
+# trocar de animal uma vez só. Sai com código 1 se alguma sessão falhar
+
+
+# Conta quantas contagens e trocas de animal cada sessão fez
+class JogoContado(jogos.WordMatrixGame):
+    __slots__ = ("contagens", "trocas")
+
+    def __init__(self, page):
+        super().__init__(page)
+        self.contagens = 0
+        self.trocas = 0
+
+    async def auto_advance(self):
+        self.contagens += 1
+        await super().auto_advance()
+
+    def new_animal(self, e=None):
+        self.trocas += 1
+        super().new_animal(e)
+
+
+def criar_sessao(loop, numero):
+    page = ft.Page(ConexaoFalsa(), f"sessao-{numero}", loop)
+    jogo = JogoContado(page)
+    page.views.append(ft.View("/jogo_figuras", controls=[jogo]))
+    page.update()
+    return page, jogo
+
+
+def evento(page, jogo):
+    return ft.ControlEvent(target="", name="submit", data="", control=jogo.input_field, page=page)
+
+
+# Vários Enter com a resposta certa, todos ao mesmo tempo
+def rajada(executor, page, jogo, tamanho):
+    def enviar():
+        jogo.input_field.value = jogo.correct_name
+        jogo.check_answer(evento(page, jogo))
+    return [executor.submit(enviar) for _ in range(tamanho)]
+
+
+def esperar(condicao, limite):
+    prazo = time.monotonic() + limite
+    while not condicao():
+        if time.monotonic() > prazo:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de estresse do autoavanço do jogo de figuras")
+    parser.add_argument("--sessoes", type=int, default=50)
+    parser.add_argument("--rajada", type=int, default=20, help="Enter simultâneos por sessão")
+    parser.add_argument("--rodadas", type=int, default=3)
+    parser.add_argument("--intervalo", type=float, default=0.05, help="segundos entre os números da contagem")
+    args = parser.parse_args()
+
+    jogos.INTERVALO_CONTAGEM = args.intervalo
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    sessoes = [criar_sessao(loop, i) for i in range(args.sessoes)]
+    falhas = 0
+    inicio = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        for rodada in range(1, args.rodadas + 1):
+            futuros = []
+            for page, jogo in sessoes:
+                futuros += rajada(executor, page, jogo, args.rajada)
+            for futuro in futuros:
+                futuro.result()
+
+            terminou = esperar(lambda: all(len(obter_agendador(page)) == 0 for page, _ in sessoes),
+                               args.intervalo * 3 + 5)
+            erradas = [jogo for _, jogo in sessoes
+                       if (jogo.score, jogo.contagens, jogo.trocas) != (rodada, rodada, rodada)]
+            falhas += len(erradas) + (not terminou)
+            print(f"rodada {rodada}: {args.sessoes * args.rajada} envios, "
+                  f"{sum(j.contagens for _, j in sessoes)} contagens, {len(erradas)} sessões erradas")
+
+        # Desconexão no meio da contagem: nenhuma sessão pode trocar de animal depois
+        for page, jogo in sessoes:
+            for futuro in rajada(executor, page, jogo, 1):
+                futuro.result()
+        trocas = [jogo.trocas for _, jogo in sessoes]
+        for page, _ in sessoes:
+            obter_agendador(page).cancelar_todas()
+        time.sleep(args.intervalo * 4)
+        trocaram = sum(1 for (_, jogo), antes in zip(sessoes, trocas) if jogo.trocas != antes)
+        falhas += trocaram
+        print(f"desconexão: {trocaram} sessões trocaram de animal depois de cancelar")
+
+    enviados = sum(page._Page__conn.bytes_enviados for page, _ in sessoes)
+    print(f"{time.monotonic() - inicio:.1f}s, {enviados / 1024:.0f} KiB enviados, {falhas} falhas")
+    loop.call_soon_threadsafe(loop.stop)
+    raise SystemExit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
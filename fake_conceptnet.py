@@ -0,0 +1,216 @@
+import argparse
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from benchmark_filtro import gerar_payload
+from busca_palavras import BASE_URL, _endpoints_en, _endpoints_pt
+
+# Servidor local que imita a API da ConceptNet, para medir a busca de palavras
+# sem depender do serviço real. Responde com respostas gravadas (gravar_respostas)
+# ou, para o que não foi gravado, com arestas sintéticas paginadas. Latência,
+# taxa de erros e tamanho das páginas são configuráveis.
+#
+#   python fake_conceptnet.py --porta 8765 --latencia 0.3
+#   CONCEPTNET_URL=http://127.0.0.1:8765 python "prototipo app python.py"
+
+
+def _no_consultado(endpoint):
+    partes = urlsplit(endpoint)
+    if partes.path.startswith("/c/"):
+        return partes.path
+    return parse_qs(partes.query).get("node", ["/c/pt/palavra"])[0]
+
+
+def _pagina_atual(endpoint):
+    consulta = parse_qs(urlsplit(endpoint).query)
+    offset = int(consulta.get("offset", ["0"])[0])
+    limite = int(consulta.get("limit", ["20"])[-1])
+    return offset, limite
+
+
+class FakeConceptNet:
+    def __init__(self, porta=0, latencia=0.2, variacao=0.05, taxa_erros=0.0,
+                 arestas_por_pagina=None, paginas=3, gravacoes=None, semente=1):
+        self.latencia = latencia
+        self.variacao = variacao
+        self.taxa_erros = taxa_erros
+        self.arestas_por_pagina = arestas_por_pagina
+        self.paginas = paginas
+        self.respostas = {}
+        if gravacoes:
+            with open(gravacoes, encoding="utf-8") as f:
+                self.respostas = json.load(f)
+
+        self.requisicoes = 0
+        self.erros = 0
+        self.bytes_enviados = 0
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.Lock()
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", porta), self._criar_handler())
+        self._servidor.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def parar(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def zerar_contadores(self):
+        with self._lock:
+            self.requisicoes = 0
+            self.erros = 0
+            self.bytes_enviados = 0
+
+    def _sortear(self):
+        with self._lock:
+            atraso = max(0, self._aleatorio.gauss(self.latencia, self.variacao))
+            falhar = self._aleatorio.random() < self.taxa_erros
+        return atraso, falhar
+
+    def responder(self, endpoint):
+        if endpoint in self.respostas:
+            return self.respostas[endpoint]
+
+        no = _no_consultado(endpoint)
+        offset, limite = _pagina_atual(endpoint)
+        total = self.arestas_por_pagina or limite
+        palavra = no.split("/")[3]
+        # Semente fixa por endpoint: a mesma URL devolve sempre as mesmas arestas
+        semente = zlib.crc32(endpoint.encode())
+        data = gerar_payload(palavra, total, semente)
+        for edge in data["edges"]:
+            for ponta in (edge["start"], edge["end"]):
+                if ponta["label"] == palavra:
+                    ponta["@id"] = no
+
+        if offset // max(limite, 1) + 1 < self.paginas:
+            base = endpoint.split("offset=")[0].rstrip("&?")
+            separador = "&" if "?" in base else "?"
+            data["view"] = {"nextPage": f"{base}{separador}offset={offset + limite}&limit={limite}"}
+        return data
+
+    def _criar_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path.startswith("/_"):
+                    return self._controle()
+
+                atraso, falhar = fake._sortear()
+                time.sleep(atraso)
+                if falhar:
+                    corpo, status = b'{"error": "fake"}', 503
+                else:
+                    corpo, status = json.dumps(fake.responder(self.path)).encode(), 200
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+                with fake._lock:
+                    fake.requisicoes += 1
+                    fake.erros += status != 200
+                    fake.bytes_enviados += len(corpo)
+
+            # Rotas de controle usadas pelo benchmark quando o servidor roda em outro processo
+            def _controle(self):
+                if self.path == "/_zerar":
+                    fake.zerar_contadores()
+                with fake._lock:
+                    corpo = json.dumps({
+                        "requisicoes": fake.requisicoes,
+                        "erros": fake.erros,
+                        "bytes_enviados": fake.bytes_enviados,
+                    }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+# Sobe a ConceptNet falsa em outro processo, para que o servidor não dispute
+# a CPU (e o GIL) com o código medido. Devolve o processo e a URL dele
+def iniciar_processo(*opcoes):
+    processo = subprocess.Popen(
+        [sys.executable, __file__, "--porta", "0", *map(str, opcoes)],
+        stdout=subprocess.PIPE, text=True
+    )
+    url = processo.stdout.readline().strip().rsplit(" ", 1)[-1]
+    return processo, url
+
+
+def contadores(url, zerar=False):
+    return requests.get(url + ("/_zerar" if zerar else "/_estatisticas"), timeout=5).json()
+
+
+# Grava as respostas reais da ConceptNet para as consultas de cada palavra,
+# no formato lido por FakeConceptNet(gravacoes=...)
+def gravar_respostas(palavras, arquivo):
+    respostas = {}
+    for palavra in palavras:
+        for endpoint in _endpoints_pt(palavra) + _endpoints_en(palavra):
+            response = requests.get(BASE_URL + endpoint, timeout=30)
+            if response.status_code == 200:
+                respostas[endpoint] = response.json()
+    with open(arquivo, "w", encoding="utf-8") as f:
+        json.dump(respostas, f, ensure_ascii=False)
+    print(f"{len(respostas)} respostas gravadas em {arquivo}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API da ConceptNet")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--latencia", type=float, default=0.2, help="latência média, em segundos")
+    parser.add_argument("--variacao", type=float, default=0.05, help="desvio padrão da latência")
+    parser.add_argument("--taxa-erros", type=float, default=0.0, help="fração de respostas 503")
+    parser.add_argument("--arestas", type=int, help="arestas por página (padrão: o limit pedido)")
+    parser.add_argument("--paginas", type=int, default=3, help="páginas por consulta")
+    parser.add_argument("--gravacoes", help="arquivo JSON gerado por --gravar")
+    parser.add_argument("--gravar", nargs="+", metavar="PALAVRA", help="grava respostas reais e sai")
+    parser.add_argument("--arquivo", default="respostas_conceptnet.json")
+    args = parser.parse_args()
+
+    if args.gravar:
+        gravar_respostas(args.gravar, args.arquivo)
+        return
+
+    fake = FakeConceptNet(args.porta, args.latencia, args.variacao, args.taxa_erros,
+                          args.arestas, args.paginas, args.gravacoes)
+    print(f"ConceptNet falsa em {fake.url}", flush=True)
+    try:
+        fake._servidor.serve_forever()
+    except KeyboardInterrupt:
+        fake.parar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+# Relações consultadas pelo jogo de letras; o código numérico é o que vai para o índice
+RELACOES = {
+    "/r/RelatedTo": 1,
+    "/r/Synonym": 2,
+    "/r/IsA": 3,
+    "/r/PartOf": 4,
+}
+RELACOES_POR_CODIGO = {codigo: rel for rel, codigo in RELACOES.items()}
+
+IDIOMAS = ("/c/pt/", "/c/en/")
+
+TAMANHO_LOTE = 10000
+
+
+def uri_termo(uri):
+    # "/c/pt/gato/n/wn/animal" -> "/c/pt/gato", como o parâmetro node= da API
+    return "/".join(uri.split("/", 4)[:4])
+
+
+def rotulo_termo(uri):
+    return uri.split("/", 4)[3].replace("_", " ")
+
+
+def _abrir_dump(caminho):
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, "rt", encoding="utf-8")
+    return open(caminho, encoding="utf-8")
+
+
+def _criar_tabelas(conexao):
+    conexao.executescript("""
+        CREATE TABLE termos (
+            id INTEGER PRIMARY KEY,
+            uri TEXT NOT NULL UNIQUE,
+            rotulo TEXT NOT NULL
+        );
+        CREATE TABLE arestas (
+            inicio INTEGER NOT NULL,
+            rel INTEGER NOT NULL,
+            fim INTEGER NOT NULL,
+            peso REAL NOT NULL,
+            PRIMARY KEY (inicio, rel, fim)
+        ) WITHOUT ROWID;
+    """)
+
+
+# Lê o CSV de asserções da ConceptNet e grava só as arestas em português e
+# inglês das relações usadas pelo jogo em um índice SQLite compacto
+def importar_dump(caminho_csv, caminho_indice):
+    temporario = caminho_indice + ".tmp"
+    if os.path.exists(temporario):
+        os.remove(temporario)
+
+    conexao = sqlite3.connect(temporario)
+    conexao.execute("PRAGMA journal_mode=OFF")
+    conexao.execute("PRAGMA synchronous=OFF")
+    _criar_tabelas(conexao)
+
+    termos = {}
+    lote = []
+    total = 0
+
+    def id_termo(uri):
+        uri = uri_termo(uri)
+        if uri not in termos:
+            termos[uri] = len(termos) + 1
+            conexao.execute("INSERT INTO termos VALUES (?, ?, ?)", (termos[uri], uri, rotulo_termo(uri)))
+        return termos[uri]
+
+    def gravar_lote():
+        # Sentidos diferentes do mesmo termo viram a mesma aresta: fica o maior peso
+        conexao.executemany(
+            "INSERT INTO arestas VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (inicio, rel, fim) DO UPDATE SET peso = max(peso, excluded.peso)",
+            lote
+        )
+        lote.clear()
+
+    with _abrir_dump(caminho_csv) as arquivo:
+        for linha in arquivo:
+            campos = linha.rstrip("\n").split("\t")
+            if len(campos) < 5 or campos[1] not in RELACOES:
+                continue
+            inicio, fim = campos[2], campos[3]
+            if not inicio.startswith(IDIOMAS) or not fim.startswith(IDIOMAS):
+                continue
+
+            peso = json.loads(campos[4]).get("weight", 1.0)
+            lote.append((id_termo(inicio), RELACOES[campos[1]], id_termo(fim), peso))
+            total += 1
+            if len(lote) >= TAMANHO_LOTE:
+                gravar_lote()
+
+    gravar_lote()
+    conexao.execute("CREATE INDEX arestas_fim ON arestas (fim, rel)")
+    conexao.commit()
+    conexao.execute("VACUUM")
+    conexao.close()
+
+    os.replace(temporario, caminho_indice)
+    return total
+
+
+# Consulta ao índice gerado por importar_dump. Devolve as arestas no mesmo
+# formato da API (start/end com @id e label), para reaproveitar os filtros
+class IndiceConceptNet:
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self._local = threading.local()
+
+    def _conexao(self):
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(f"file:{self.arquivo}?mode=ro", uri=True, check_same_thread=False)
+            conexao.execute("PRAGMA mmap_size=268435456")
+            self._local.conexao = conexao
+        return conexao
+
+    def consultar(self, no, rel=None, limite=50):
+        conexao = self._conexao()
+        linha = conexao.execute("SELECT id FROM termos WHERE uri = ?", (no,)).fetchone()
+        if linha is None:
+            return []
+
+        id_no = linha[0]
+        if rel is None:
+            filtro, parametros = "", (id_no, id_no, limite)
+        else:
+            filtro, parametros = " AND rel = ?", (id_no, RELACOES[rel], id_no, RELACOES[rel], limite)
+
+        linhas = conexao.execute(f"""
+            SELECT a.rel, a.peso, i.uri, i.rotulo, f.uri, f.rotulo
+            FROM (
+                SELECT inicio, rel, fim, peso FROM arestas WHERE inicio = ?{filtro}
+                UNION ALL
+                SELECT inicio, rel, fim, peso FROM arestas WHERE fim = ?{filtro}
+            ) AS a
+            JOIN termos AS i ON i.id = a.inicio
+            JOIN termos AS f ON f.id = a.fim
+            ORDER BY a.peso DESC
+            LIMIT ?
+        """, parametros).fetchall()
+
+        return [
+            {
+                "rel": {"@id": RELACOES_POR_CODIGO[rel_codigo]},
+                "start": {"@id": uri_inicio, "label": rotulo_inicio},
+                "end": {"@id": uri_fim, "label": rotulo_fim},
+                "weight": peso,
+            }
+            for rel_codigo, peso, uri_inicio, rotulo_inicio, uri_fim, rotulo_fim in linhas
+        ]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Uso: python indice_conceptnet.py conceptnet-assertions.csv[.gz] [indice_conceptnet.db]")
+        sys.exit(1)
+
+    destino = sys.argv[2] if len(sys.argv) == 3 else "indice_conceptnet.db"
+    arestas = importar_dump(sys.argv[1], destino)
+    print(f"{arestas} arestas importadas para {destino}")
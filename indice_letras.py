@@ -0,0 +1,154 @@
+import threading
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+from string import ascii_lowercase
+
+# Índice das letras de cada nome de um catálogo, para as perguntas do tipo
+# "quantas letras 'P' há no nome?". As contagens ignoram acentos e maiúsculas
+# ("Pássaro" tem duas letras A, "Águia" tem duas) e são calculadas uma vez por
+# item, quando a lista é carregada: conferir uma resposta é só ler um byte.
+#
+# Cada item ocupa uma linha fixa de um bytearray: uma contagem por letra de
+# a a z e, no fim, o total de letras do nome (espaços e hífens não contam)
+
+ALFABETO = ascii_lowercase
+VOGAIS = "aeiou"
+_POSICAO = {letra: posicao for posicao, letra in enumerate(ALFABETO)}
+_LINHA = len(ALFABETO) + 1
+_MAXIMO = 255
+
+# Frequência de cada tipo de pergunta no sorteio
+PESOS_PERGUNTAS = {"letra": 3, "vogais": 1, "tamanho": 1}
+
+# tipo: "letra", "vogais" ou "tamanho"; letra só vale para o tipo "letra"
+Pergunta = namedtuple("Pergunta", "tipo letra texto resposta")
+
+
+# Letra de a a z que um caractere representa ("Á" -> "a", "ç" -> "c"), ou "" se não for letra
+@lru_cache(maxsize=1024)
+def letra_base(caractere):
+    if not caractere.isalpha():
+        return ""
+    base = unicodedata.normalize("NFD", caractere.lower())[0]
+    return base if base in _POSICAO else ""
+
+
+def contar_letras(nome):
+    linha = bytearray(_LINHA)
+    for caractere in nome:
+        if caractere.isalpha():
+            letra = letra_base(caractere)
+            if letra:
+                linha[_POSICAO[letra]] = min(linha[_POSICAO[letra]] + 1, _MAXIMO)
+            linha[-1] = min(linha[-1] + 1, _MAXIMO)
+    return linha
+
+
+def texto_pergunta(tipo, letra=""):
+    if tipo == "letra":
+        return f"Quantas letras '{letra.upper()}' há no nome?"
+    if tipo == "vogais":
+        return "Quantas vogais há no nome?"
+    return "Quantas letras há no nome?"
+
+
+# Frase da resposta certa, para mostrar quando o jogador erra
+def descrever_resposta(pergunta):
+    n = pergunta.resposta
+    if pergunta.tipo == "letra":
+        return f"Tem {n} {'letra' if n == 1 else 'letras'} '{pergunta.letra.upper()}'"
+    if pergunta.tipo == "vogais":
+        return f"Tem {n} {'vogal' if n == 1 else 'vogais'}"
+    return f"Tem {n} {'letra' if n == 1 else 'letras'}"
+
+
+# Índice de uma lista de itens (nomes ou Item do pacote de conteúdo). Como o
+# Baralho, não copia a lista: itens adicionados depois (as palavras que a busca
+# da ConceptNet ainda está trazendo) são indexados na primeira consulta
+class IndiceLetras:
+    __slots__ = ("itens", "_contagens", "_quantidade", "_presentes", "_lock")
+
+    def __init__(self, itens):
+        self.itens = itens
+        self._contagens = bytearray()
+        self._quantidade = 0
+        # Quantos itens têm cada letra: perguntas sobre letras que não aparecem
+        # em nenhum nome do catálogo (ex.: W) não são sorteadas
+        self._presentes = [0] * len(ALFABETO)
+        self._lock = threading.Lock()
+        self._incluir_novos()
+
+    def _incluir_novos(self):
+        if self._quantidade == len(self.itens):
+            return
+        with self._lock:
+            for indice in range(self._quantidade, len(self.itens)):
+                item = self.itens[indice]
+                linha = contar_letras(getattr(item, "nome", item))
+                for posicao in range(len(ALFABETO)):
+                    self._presentes[posicao] += linha[posicao] > 0
+                self._contagens += linha
+                self._quantidade = indice + 1
+
+    def __len__(self):
+        self._incluir_novos()
+        return self._quantidade
+
+    def contar(self, indice, letra):
+        self._incluir_novos()
+        posicao = _POSICAO.get(letra_base(letra))
+        return 0 if posicao is None else self._contagens[_LINHA * indice + posicao]
+
+    def vogais(self, indice):
+        self._incluir_novos()
+        inicio = _LINHA * indice
+        return sum(self._contagens[inicio + _POSICAO[vogal]] for vogal in VOGAIS)
+
+    def tamanho(self, indice):
+        self._incluir_novos()
+        return self._contagens[_LINHA * indice + _LINHA - 1]
+
+    # Todas as perguntas que podem ser feitas sobre o item, já com a resposta
+    def perguntas(self, indice):
+        self._incluir_novos()
+        inicio = _LINHA * indice
+        perguntas = [Pergunta("letra", letra, texto_pergunta("letra", letra), self._contagens[inicio + posicao])
+                     for posicao, letra in enumerate(ALFABETO) if self._presentes[posicao]]
+        perguntas.append(Pergunta("vogais", "", texto_pergunta("vogais"), self.vogais(indice)))
+        perguntas.append(Pergunta("tamanho", "", texto_pergunta("tamanho"), self.tamanho(indice)))
+        return perguntas
+
+    # Sorteia uma pergunta sobre o item: primeiro o tipo (pelos PESOS_PERGUNTAS)
+    # e, entre as perguntas desse tipo, a resposta. Sorteando a letra direto,
+    # quase toda resposta seria 0 (a maioria das letras não está no nome); aqui
+    # sai, entre as respostas possíveis para o item, a que menos saiu até agora
+    # (respostas_dadas conta quantas vezes cada uma já saiu na sessão)
+    def sortear_pergunta(self, indice, aleatorio, respostas_dadas=None):
+        tipo = aleatorio.choices(list(PESOS_PERGUNTAS), weights=list(PESOS_PERGUNTAS.values()))[0]
+        por_resposta = {}
+        for pergunta in self.perguntas(indice):
+            if pergunta.tipo == tipo:
+                por_resposta.setdefault((tipo, pergunta.resposta), []).append(pergunta)
+        if respostas_dadas is None:
+            respostas_dadas = {}
+
+        menos_usada = min(respostas_dadas.get(chave, 0) for chave in por_resposta)
+        chave = aleatorio.choice(sorted(c for c in por_resposta if respostas_dadas.get(c, 0) == menos_usada))
+        respostas_dadas[chave] = menos_usada + 1
+        return aleatorio.choice(por_resposta[chave])
+
+
+_indices = {}
+_indices_lock = threading.Lock()
+
+
+# Índice compartilhado de um catálogo do pacote de conteúdo: é o mesmo objeto
+# para todas as sessões do processo, então é calculado uma vez só
+def indice_do_catalogo(catalogo):
+    with _indices_lock:
+        # O índice guarda o catálogo, então o id não é reaproveitado por outro objeto
+        indice = _indices.get(id(catalogo))
+        if indice is None:
+            indice = _indices[id(catalogo)] = IndiceLetras(catalogo)
+        return indice
@@ -0,0 +1,36 @@
+import json
+import os
+
+from flet_core.protocol import CommandEncoder
+
+# Com INSTRUMENTAR_UPDATES=1, cada envio de atualizações para o navegador é
+# registrado com a quantidade de controles e de bytes que foram pelo websocket
+INSTRUMENTAR_UPDATES = os.getenv("INSTRUMENTAR_UPDATES") == "1"
+
+
+# Quantos controles um lote de comandos do Flet cria, altera ou remove
+def contar_controles(comandos):
+    total = 0
+    for comando in comandos:
+        if comando.name == "add":
+            total += len(comando.commands)
+        elif comando.name == "remove":
+            total += len(comando.values)
+        elif comando.name == "set":
+            total += 1
+    return total
+
+
+def instrumentar(page):
+    conexao = page.connection
+    if getattr(conexao, "instrumentada", False):
+        return
+    enviar = conexao.send_commands
+
+    def send_commands(session_id, commands):
+        tamanho = len(json.dumps(commands, cls=CommandEncoder, separators=(",", ":")))
+        print(f"[update] {page.route}: {contar_controles(commands)} controles, {tamanho} bytes")
+        return enviar(session_id, commands)
+
+    conexao.send_commands = send_commands
+    conexao.instrumentada = True
@@ -0,0 +1,500 @@
+import asyncio
+import os
+import threading
+
+import flet as ft
+
+from agendador import obter_agendador
+from baralho import Baralho
+from conteudo import obter_pacote
+from correspondencia import indice_respostas
+from dificuldade import SeletorPalavras
+from estado_sessao import obter_estado_jogador
+from estilos import ANIMACAO_LENTA, ANIMACAO_RAPIDA, COLOR_ACCENT, COLOR_PRIMARY, COLOR_SECONDARY, COLOR_TEXT, cartao, header, styled_button
+from indice_letras import descrever_resposta, indice_do_catalogo
+from metricas import medir
+
+# Cor das letras ainda não clicadas no jogo de letras
+COR_LETRA = ft.colors.with_opacity(0.1, COLOR_SECONDARY)
+
+# Quantos botões de letra escondidos o jogo de letras guarda para as próximas palavras
+LETRAS_SOBRANDO_MAX = 8
+
+# Intervalo, em segundos, entre os números da contagem do autoavanço
+INTERVALO_CONTAGEM = 1
+
+# Tema do pacote de conteúdo (conteudo_fonte/<tema>.tsv) usado no jogo de figuras
+TEMA_FIGURAS = os.getenv("TEMA_FIGURAS", "animais")
+# Categoria do tema (sem ela, todas) e faixa de dificuldade, de 1 a 5, dos itens do jogo de figuras
+CATEGORIA_FIGURAS = os.getenv("CATEGORIA_FIGURAS") or None
+DIFICULDADE_FIGURAS = (int(os.getenv("DIFICULDADE_FIGURAS_MIN", 1)), int(os.getenv("DIFICULDADE_FIGURAS_MAX", 5)))
+
+_figuras = {}
+_figuras_lock = threading.Lock()
+
+
+# Posições, no catálogo, dos itens que entram no jogo de figuras: só os que têm
+# figura (alguns temas, como o de futebol, têm itens só com o nome). A lista é
+# calculada uma vez por processo; se todos os itens entram, é só um range
+def indices_figuras(catalogo, categoria=CATEGORIA_FIGURAS, dificuldade=DIFICULDADE_FIGURAS):
+    with _figuras_lock:
+        chave = (id(catalogo), categoria, dificuldade)
+        indices = _figuras.get(chave)
+        if indices is None:
+            indices = _figuras[chave] = _com_figura(catalogo, categoria, dificuldade)
+        return indices
+
+
+def _com_figura(catalogo, categoria, dificuldade):
+    if categoria is None and dificuldade == (1, 5):
+        candidatos = range(len(catalogo))
+    else:
+        candidatos = catalogo.indices(categoria, *dificuldade)
+    indices = [indice for indice in candidatos if catalogo[indice].figura]
+    if not indices:
+        print(f"Nenhum item com figura no tema {catalogo.nome} na categoria {categoria} com dificuldade {dificuldade} "
+              f"(categorias: {', '.join(catalogo.categorias())}); usando o tema inteiro")
+        indices = [indice for indice in range(len(catalogo)) if catalogo[indice].figura]
+    if len(indices) == len(catalogo):
+        return range(len(catalogo))
+    return indices
+
+
+def _montar_indices(tema):
+    catalogo = obter_pacote().tema(tema)
+    indice_do_catalogo(catalogo)
+    indice_respostas(catalogo)
+    indices_figuras(catalogo)
+
+
+# Monta em segundo plano os índices do catálogo (contagem de letras e conferência
+# das respostas), para o primeiro jogador não esperar por eles
+def preparar_catalogo(tema=TEMA_FIGURAS):
+    threading.Thread(target=_montar_indices, args=(tema,), name="catalogo", daemon=True).start()
+
+
+# Jogo de letras
+class WordGame(ft.Column):
+    # semente: torna a sessão reproduzível (mesmas palavras na mesma ordem e mesmo embaralhamento);
+    # pesos: pesos das arestas da busca que trouxe as palavras, usados na dificuldade
+    def __init__(self, page, palavras, semente=None, pesos=None):
+        super().__init__()
+        self.words = palavras
+        # As palavras saem pela dificuldade, que acompanha os acertos da criança
+        self.deck = SeletorPalavras(palavras, semente, pesos=pesos)
+        # Palavras já sorteadas e a dificuldade alvo continuam valendo se o jogador voltar por outra conexão
+        self.state = obter_estado_jogador(page)
+        self.deck.restaurar(self.state.obter("baralho_palavras") or {})
+        self.selected_word = self.get_new_word()
+        self.shuffled_word = self.shuffle_word(self.selected_word)
+        self.current_letter_index = 0
+
+        self.word_display = ft.Container(
+            content=ft.Text(
+                value=f"Palavra: {self.selected_word}",
+                size=24,
+                weight=ft.FontWeight.BOLD,
+                text_align=ft.TextAlign.CENTER,
+                color=COLOR_TEXT
+            ),
+            padding=10,
+            bgcolor=ft.colors.with_opacity(0.1, COLOR_PRIMARY),
+            border_radius=10,
+            width=600
+        )
+
+        self.letters_row = ft.Row(
+            alignment=ft.MainAxisAlignment.CENTER,
+            wrap=True,
+            spacing=10,
+            run_spacing=10,
+            width=600
+        )
+        # Os botões de letra são a própria lista de controles da fileira
+        self.letter_buttons = self.letters_row.controls
+        self.update_letter_buttons()
+
+        self.result_text = ft.Container(
+            content=ft.Text(
+                "",
+                size=18,
+                weight=ft.FontWeight.BOLD,
+                text_align=ft.TextAlign.CENTER
+            ),
+            padding=10,
+            border_radius=10,
+            width=600
+        )
+
+        self.controls.extend([
+            header("Jogo de Letras"),
+            cartao(
+                ft.Column(
+                    [
+                        self.word_display,
+                        ft.Divider(height=20, color=ft.colors.TRANSPARENT),
+                        ft.Text("Clique nas letras na ordem correta:",
+                               size=16,
+                               color=COLOR_TEXT),
+                        self.letters_row,
+                        self.result_text,
+                        ft.Row([
+                            styled_button(
+                                "Nova Palavra",
+                                self.reload_word,
+                                icon=ft.icons.REFRESH,
+                                width=180
+                            ),
+                            styled_button(
+                                "Voltar",
+                                lambda e: page.go("/"),
+                                icon=ft.icons.ARROW_BACK,
+                                width=150,
+                                bgcolor=ft.colors.GREY
+                            ),
+                            styled_button(
+                                "Jogo de Figuras",
+                                lambda e: page.go("/jogo_figuras"),
+                                icon=ft.icons.IMAGE,
+                                width=180
+                            ),
+                        ], alignment=ft.MainAxisAlignment.CENTER, spacing=10)
+                    ],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                    spacing=15
+                )
+            )
+        ])
+
+    def get_new_word(self):
+        new_word = self.deck.tirar()
+        self.state.atualizar(baralho_palavras=self.deck.estado())
+        return new_word
+
+    def shuffle_word(self, word):
+        letters = list(word)
+        self.deck.aleatorio.shuffle(letters)
+        return letters
+
+    # Cada botão é uma posição fixa da fileira; a letra dele é lida na hora do clique
+    def create_letter_button(self, index):
+        return ft.Container(
+            content=ft.Text(
+                "",
+                size=20,
+                weight=ft.FontWeight.BOLD,
+                color=COLOR_TEXT
+            ),
+            width=50,
+            height=50,
+            alignment=ft.alignment.center,
+            bgcolor=COR_LETRA,
+            border_radius=10,
+            animate=ANIMACAO_RAPIDA,
+            on_click=lambda e: self.check_letter(e, self.shuffled_word[index]),
+            ink=True
+        )
+
+    # Reaproveita os botões da palavra anterior: só cria botões quando a palavra
+    # nova é maior e, quando é menor, esconde os que sobram. O Flet só envia os
+    # atributos que mudaram, então uma letra repetida na mesma posição não gera tráfego
+    def update_letter_buttons(self):
+        buttons = self.letter_buttons
+        while len(buttons) < len(self.shuffled_word):
+            buttons.append(self.create_letter_button(len(buttons)))
+        # Depois de uma palavra muito longa, não vale a pena manter tantos botões escondidos
+        del buttons[len(self.shuffled_word) + LETRAS_SOBRANDO_MAX:]
+
+        for index, button in enumerate(buttons):
+            if index < len(self.shuffled_word):
+                button.content.value = self.shuffled_word[index]
+                button.content.color = COLOR_TEXT
+                button.bgcolor = COR_LETRA
+                button.visible = True
+            else:
+                button.visible = False
+
+    @medir("check_letter")
+    def check_letter(self, e, clicked_letter):
+        correct_letter = self.selected_word[self.current_letter_index]
+        self.deck.registrar(clicked_letter == correct_letter)
+        if clicked_letter == correct_letter:
+            e.control.bgcolor = ft.colors.GREEN
+            e.control.content.color = ft.colors.WHITE
+            e.control.elevation = 0
+            self.current_letter_index += 1
+            if self.current_letter_index == len(self.selected_word):
+                self.result_text.content.value = "Parabéns! Você acertou a palavra! 🎉"
+                self.result_text.content.color = ft.colors.GREEN
+                self.result_text.bgcolor = ft.colors.with_opacity(0.1, ft.colors.GREEN)
+        else:
+            self.result_text.content.value = "Letra errada. Tente novamente!"
+            self.result_text.content.color = ft.colors.RED
+            self.result_text.bgcolor = ft.colors.with_opacity(0.1, ft.colors.RED)
+        # Só o botão clicado e a mensagem mudam; o resto do jogo não precisa ser comparado
+        self.page.update(e.control, self.result_text)
+
+    def reload_word(self, e):
+        self.selected_word = self.get_new_word()
+        self.shuffled_word = self.shuffle_word(self.selected_word)
+        self.current_letter_index = 0
+        self.update_letter_buttons()
+        self.result_text.content.value = ""
+        self.result_text.bgcolor = None
+        self.word_display.content.value = f"Palavra: {self.selected_word}"
+        self.page.update(self.word_display, self.letters_row, self.result_text)
+
+
+# Jogo de figuras com autoavanço
+class WordMatrixGame(ft.Column):
+    def __init__(self, page, semente=None, tema=TEMA_FIGURAS):
+        super().__init__()
+        # Os itens ficam no pacote (compartilhado pelo processo inteiro); o baralho só guarda índices
+        self.catalog = obter_pacote().tema(tema)
+        # Contagens de letras dos nomes, calculadas uma vez por catálogo para todas as sessões
+        self.letters = indice_do_catalogo(self.catalog)
+        # Nomes normalizados do catálogo, para aceitar respostas sem acento e com erros de digitação
+        self.answers = indice_respostas(self.catalog)
+        # Quantas vezes cada resposta já saiu nas perguntas de contagem desta sessão
+        self.answers_given = {}
+        # O baralho tira posições do catálogo, entre as da categoria e dificuldade configuradas
+        self.deck = Baralho(indices_figuras(self.catalog), semente)
+        self.scheduler = obter_agendador(page)
+        # Acertos e animais já vistos continuam valendo se o jogador voltar por outra conexão
+        self.state = obter_estado_jogador(page)
+        self.deck.restaurar(self.state.obter("baralho_animais") or {})
+        self.draw_animal()
+
+        # Contador de acertos
+        self.score = self.state.obter("acertos", 0)
+        self.score_display = ft.Text(
+            value=f"Acertos: {self.score}",
+            size=20,
+            weight=ft.FontWeight.BOLD,
+            color=COLOR_PRIMARY
+        )
+
+        self.emoji_display = ft.Container(
+            content=ft.Text(
+                value=self.selected_emoji,
+                size=120,
+                text_align=ft.TextAlign.CENTER
+            ),
+            padding=20,
+            bgcolor=ft.colors.with_opacity(0.05, COLOR_PRIMARY),
+            border_radius=20,
+            animate=ANIMACAO_LENTA
+        )
+
+        self.input_field = ft.TextField(
+            label="Digite o nome do animal",
+            text_align=ft.TextAlign.CENTER,
+            on_submit=self.check_answer,
+            width=300,
+            border_color=COLOR_PRIMARY,
+            focused_border_color=COLOR_ACCENT,
+            prefix_icon=ft.icons.EDIT,
+            border_radius=10,
+            autofocus=True
+        )
+
+        self.result_text = ft.Container(
+            content=ft.Text(
+                "",
+                size=18,
+                weight=ft.FontWeight.BOLD,
+                text_align=ft.TextAlign.CENTER
+            ),
+            padding=10,
+            border_radius=10,
+            animate=ANIMACAO_RAPIDA
+        )
+
+        self.letter_count_field = ft.TextField(
+            label=self.question.texto,
+            text_align=ft.TextAlign.CENTER,
+            on_submit=self.check_letter_count,
+            width=300,
+            border_color=COLOR_PRIMARY,
+            focused_border_color=COLOR_ACCENT,
+            prefix_icon=ft.icons.FILTER_1,
+            border_radius=10
+        )
+
+        self.letter_count_result = ft.Container(
+            content=ft.Text(
+                "",
+                size=18,
+                weight=ft.FontWeight.BOLD,
+                text_align=ft.TextAlign.CENTER
+            ),
+            padding=10,
+            border_radius=10,
+            animate=ANIMACAO_RAPIDA
+        )
+
+        self.timer = ft.Text(
+            value="",
+            size=16,
+            color=COLOR_TEXT,
+            visible=False
+        )
+
+        self.controls.extend([
+            header("Jogo de Figuras"),
+            cartao(
+                ft.Column(
+                    [
+                        ft.Row(
+                            [
+                                ft.Text("Adivinhe o Animal",
+                                       size=22,
+                                       weight=ft.FontWeight.BOLD,
+                                       color=COLOR_TEXT),
+                                self.score_display,
+                                self.timer
+                            ],
+                            alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                            vertical_alignment=ft.CrossAxisAlignment.CENTER
+                        ),
+                        self.emoji_display,
+                        self.input_field,
+                        self.result_text,
+                        self.letter_count_field,
+                        self.letter_count_result,
+                        ft.Row([
+                            styled_button(
+                                "Novo Animal",
+                                self.new_animal,
+                                icon=ft.icons.REFRESH,
+                                width=180
+                            ),
+                            styled_button(
+                                "Voltar",
+                                lambda e: page.go("/"),
+                                icon=ft.icons.ARROW_BACK,
+                                width=150,
+                                bgcolor=ft.colors.GREY
+                            ),
+                            styled_button(
+                                "Jogo de Letras",
+                                lambda e: page.go("/jogo_letras"),
+                                icon=ft.icons.TEXT_FIELDS,
+                                width=180
+                            ),
+                        ], alignment=ft.MainAxisAlignment.CENTER, spacing=10)
+                    ],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                    spacing=20
+                )
+            )
+        ])
+
+    def new_animal(self, e=None):
+        # Clique em "Novo Animal": o autoavanço pendente deixa de valer
+        if e is not None:
+            self.scheduler.cancelar("autoavanco")
+
+        self.draw_animal()
+
+        self.emoji_display.content.value = self.selected_emoji
+        self.emoji_display.bgcolor = ft.colors.with_opacity(0.05, COLOR_PRIMARY)
+        self.input_field.value = ""
+        self.letter_count_field.value = ""
+        self.letter_count_field.label = self.question.texto
+        self.result_text.content.value = ""
+        self.result_text.bgcolor = None
+        self.letter_count_result.content.value = ""
+        self.letter_count_result.bgcolor = None
+        self.timer.visible = False
+
+        # Define foco automático no campo de entrada
+        if self.page:
+            self.input_field.focus()
+            self.page.update(self.emoji_display, self.timer, self.result_text,
+                             self.letter_count_field, self.letter_count_result)
+
+    # Seleciona um novo animal aleatório; nenhum se repete até todos terem aparecido.
+    # A pergunta de contagem (letra, vogais ou tamanho do nome) é sorteada junto
+    def draw_animal(self):
+        indice = self.selected_index = self.deck.tirar()
+        item = self.catalog[indice]
+        self.selected_emoji = item.figura
+        self.correct_name = item.nome
+        self.question = self.letters.sortear_pergunta(indice, self.deck.aleatorio, self.answers_given)
+        self.state.atualizar(baralho_animais=self.deck.estado())
+
+    @medir("auto_advance")
+    async def auto_advance(self):
+        # Mostra contagem regressiva
+        self.timer.visible = True
+        for i in range(3, 0, -1):
+            self.timer.value = f"Próximo animal em: {i}"
+            # Se o jogador saiu da página, a contagem segue sem atualizar a tela
+            if self.page:
+                self.timer.update()
+            await asyncio.sleep(INTERVALO_CONTAGEM)
+
+        self.new_animal()
+
+    @medir("check_answer")
+    def check_answer(self, e):
+        # Durante a contagem o animal já foi acertado: novos envios são ignorados
+        if self.scheduler.pendente("autoavanco"):
+            return
+
+        # Vale sem acento, com maiúsculas e com poucos erros de digitação; se a
+        # resposta for parecida com outro nome do catálogo, a mensagem diz qual
+        matches = self.answers.procurar(self.input_field.value)
+        match = next((m for m in matches if m.indice == self.selected_index), None)
+        if match is not None:
+            # Agenda o autoavanço; com vários Enter seguidos (handlers em threads
+            # diferentes) só o primeiro agenda e conta o acerto
+            if not self.scheduler.agendar("autoavanco", self.auto_advance):
+                return
+
+            self.score += 1
+            self.state.atualizar(acertos=self.score)
+            self.score_display.value = f"Acertos: {self.score}"
+
+            self.result_text.content.value = "Correto! 🎉" if match.distancia == 0 else f"Correto! 🎉 Escreve-se: {self.correct_name}"
+            self.result_text.content.color = ft.colors.GREEN
+            self.result_text.bgcolor = ft.colors.with_opacity(0.1, ft.colors.GREEN)
+            self.emoji_display.bgcolor = ft.colors.with_opacity(0.1, ft.colors.GREEN)
+
+            # Limpa os campos
+            self.input_field.value = ""
+            self.letter_count_field.value = ""
+        else:
+            if matches:
+                self.result_text.content.value = f"Incorreto! Você escreveu {matches[0].nome}. O correto é: {self.correct_name}"
+            else:
+                self.result_text.content.value = f"Incorreto! O correto é: {self.correct_name}"
+            self.result_text.content.color = ft.colors.RED
+            self.result_text.bgcolor = ft.colors.with_opacity(0.1, ft.colors.RED)
+            self.emoji_display.bgcolor = ft.colors.with_opacity(0.1, ft.colors.RED)
+
+        self.page.update(self.score_display, self.emoji_display, self.input_field,
+                         self.result_text, self.letter_count_field)
+
+    @medir("check_letter_count")
+    def check_letter_count(self, e):
+        correct_count = self.question.resposta
+        try:
+            user_count = int(self.letter_count_field.value)
+            if user_count == correct_count:
+                self.letter_count_result.content.value = "Correto! ✅"
+                self.letter_count_result.content.color = ft.colors.GREEN
+                self.letter_count_result.bgcolor = ft.colors.with_opacity(0.1, ft.colors.GREEN)
+            else:
+                self.letter_count_result.content.value = f"Incorreto! {descrever_resposta(self.question)}"
+                self.letter_count_result.content.color = ft.colors.RED
+                self.letter_count_result.bgcolor = ft.colors.with_opacity(0.1, ft.colors.RED)
+        except:
+            self.letter_count_result.content.value = "Digite um número válido"
+            self.letter_count_result.content.color = ft.colors.RED
+            self.letter_count_result.bgcolor = ft.colors.with_opacity(0.1, ft.colors.RED)
+        self.letter_count_result.update()
+
@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import itertools
+import os
+import signal
+import subprocess
+import sys
+
+# Sobe vários servidores do app (um por núcleo, por padrão) atrás de um proxy
+# TCP local que distribui as conexões entre eles em rodízio.
+#
+#   python lancador.py                         # http://127.0.0.1:8550
+#   python lancador.py --trabalhadores 4 --porta 8080
+#
+# Cada conexão websocket fica em um servidor só, mas uma reconexão pode cair em
+# outro: por isso o estado dos jogadores vai para um backend compartilhado
+# (ESTADO_SESSAO, por padrão um SQLite em estado_sessoes.db; veja estado_sessao.py)
+
+ARQUIVO_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prototipo app python.py")
+HOST = "127.0.0.1"
+
+
+def iniciar_trabalhador(numero, porta):
+    env = dict(os.environ)
+    env.update({
+        # Servidor web sem abrir o navegador, na porta deste trabalhador
+        "FLET_FORCE_WEB_SERVER": "true",
+        "FLET_SERVER_IP": HOST,
+        "FLET_SERVER_PORT": str(porta),
+        # Só o primeiro aquece o cache de palavras, que é compartilhado em disco
+        "AQUECIMENTO_ATIVO": "1" if numero == 0 else "0",
+    })
+    env.setdefault("ESTADO_SESSAO", "sqlite:estado_sessoes.db")
+    # Cada servidor expõe as próprias métricas, na porta seguinte à do anterior
+    if env.get("METRICAS_PORTA"):
+        env["METRICAS_PORTA"] = str(int(env["METRICAS_PORTA"]) + numero)
+    return subprocess.Popen([sys.executable, ARQUIVO_APP], env=env, cwd=os.path.dirname(ARQUIVO_APP))
+
+
+async def encaminhar(leitor, escritor):
+    try:
+        while dados := await leitor.read(65536):
+            escritor.write(dados)
+            await escritor.drain()
+    except ConnectionError:
+        pass
+    finally:
+        escritor.close()
+
+
+class Proxy:
+    def __init__(self, portas):
+        self.portas = portas
+        self._rodizio = itertools.cycle(portas)
+
+    async def atender(self, leitor_cliente, escritor_cliente):
+        # Se um servidor estiver fora do ar (reiniciando), tenta o próximo
+        for _ in range(len(self.portas)):
+            porta = next(self._rodizio)
+            try:
+                leitor, escritor = await asyncio.open_connection(HOST, porta)
+                break
+            except OSError:
+                continue
+        else:
+            escritor_cliente.close()
+            return
+
+        await asyncio.gather(
+            encaminhar(leitor_cliente, escritor),
+            encaminhar(leitor, escritor_cliente),
+        )
+
+
+# Reinicia os servidores que caírem
+async def supervisionar(trabalhadores, portas):
+    while True:
+        await asyncio.sleep(2)
+        for numero, processo in enumerate(trabalhadores):
+            if processo.poll() is not None:
+                print(f"Servidor {numero} (porta {portas[numero]}) saiu com código {processo.returncode}; reiniciando")
+                trabalhadores[numero] = iniciar_trabalhador(numero, portas[numero])
+
+
+async def executar(trabalhadores_total, porta, porta_base):
+    portas = [porta_base + i for i in range(trabalhadores_total)]
+    trabalhadores = [iniciar_trabalhador(numero, p) for numero, p in enumerate(portas)]
+    # SIGTERM (ex.: o teste_carga.py encerrando o lançador) passa pelo finally
+    # abaixo; sem isso o lançador morre e os servidores ficam no ar sozinhos
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    try:
+        proxy = Proxy(portas)
+        servidor = await asyncio.start_server(proxy.atender, HOST, porta)
+        print(f"{trabalhadores_total} servidores nas portas {portas[0]}-{portas[-1]}, "
+              f"atendendo em http://{HOST}:{porta}")
+        async with servidor:
+            await asyncio.gather(servidor.serve_forever(), supervisionar(trabalhadores, portas))
+    finally:
+        for processo in trabalhadores:
+            processo.terminate()
+        for processo in trabalhadores:
+            processo.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vários servidores do app atrás de um proxy local")
+    parser.add_argument("--trabalhadores", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--porta", type=int, default=8550, help="porta pública do proxy")
+    parser.add_argument("--porta-base", type=int, default=8600, help="porta do primeiro servidor")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(executar(args.trabalhadores, args.porta, args.porta_base))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
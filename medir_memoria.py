@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import tracemalloc
+
+import flet as ft
+from flet_core.connection import Connection
+from flet_core.protocol import CommandEncoder, PageCommandsBatchResponsePayload
+
+from jogos import WordGame, WordMatrixGame
+
+# Mede a memória ocupada por sessão, para dimensionar os servidores.
+#
+#   python medir_memoria.py                  # 1000 sessões com os dois jogos abertos
+#   python medir_memoria.py --sessoes 200
+#
+# Cada sessão simulada é uma ft.Page ligada a uma conexão falsa (que só
+# devolve ids para os controles), com as views dos dois jogos montadas como
+# no app. A conta é feita com tracemalloc, depois de um gc.collect()
+
+PALAVRAS = [
+    "gato", "felino", "animal", "bicho", "rato", "leite", "miau", "tigre", "leão", "pata",
+    "doméstico", "bigode", "cauda", "telhado", "caçador", "filhote", "ronronar", "unha",
+]
+
+
+# Conexão que não manda nada para lugar nenhum: só numera os controles adicionados
+class ConexaoFalsa(Connection):
+    ids = itertools.count(1)
+
+    def __init__(self):
+        super().__init__()
+        self.page_url = "http://127.0.0.1"
+        self.bytes_enviados = 0
+
+    def send_commands(self, session_id, commands):
+        self.bytes_enviados += len(json.dumps(commands, cls=CommandEncoder, separators=(",", ":")))
+        resultados = []
+        for comando in commands:
+            if comando.name == "add":
+                resultados.append(" ".join(str(next(self.ids)) for _ in comando.commands))
+        return PageCommandsBatchResponsePayload(results=resultados, error="")
+
+    def send_command(self, session_id, command):
+        return self.send_commands(session_id, [command])
+
+
+def criar_sessao(loop, numero):
+    page = ft.Page(ConexaoFalsa(), f"sessao-{numero}", loop)
+    page.views.clear()
+    page.views.append(ft.View("/jogo_letras", controls=[WordGame(page, list(PALAVRAS))]))
+    page.views.append(ft.View("/jogo_figuras", controls=[WordMatrixGame(page)]))
+    page.update()
+    return page
+
+
+async def medir(sessoes):
+    loop = asyncio.get_running_loop()
+    # Uma sessão antes da medição, para que imports e caches do flet não entrem na conta
+    criar_sessao(loop, -1)
+
+    gc.collect()
+    tracemalloc.start()
+    antes, _ = tracemalloc.get_traced_memory()
+    pages = [criar_sessao(loop, i) for i in range(sessoes)]
+    gc.collect()
+    depois, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    enviados = sum(page._Page__conn.bytes_enviados for page in pages)
+    return (depois - antes) / sessoes, pico - antes, enviados / sessoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória por sessão dos jogos")
+    parser.add_argument("--sessoes", type=int, default=1000)
+    args = parser.parse_args()
+
+    por_sessao, pico, enviados = asyncio.run(medir(args.sessoes))
+    print(f"{args.sessoes} sessões simuladas")
+    print(f"memória por sessão:   {por_sessao / 1024:8.1f} KiB")
+    print(f"pico total:           {pico / 1024 / 1024:8.1f} MiB")
+    print(f"enviado ao montar:    {enviados / 1024:8.1f} KiB por sessão")
+    for usuarios in (100, 500, 1000):
+        print(f"  {usuarios:>5} usuários ≈ {por_sessao * usuarios / 1024 / 1024:6.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Com METRICAS=1, os handlers dos jogos, as rotas e as requisições à ConceptNet
+# registram latência, erros e códigos de status. As métricas saem no log a cada
+# METRICAS_LOG segundos (0 desliga) e, com METRICAS_PORTA, também em
+# http://127.0.0.1:<porta>/metrics no formato texto do Prometheus
+METRICAS_ATIVAS = os.getenv("METRICAS") == "1"
+METRICAS_PORTA = int(os.getenv("METRICAS_PORTA", 0))
+METRICAS_LOG = int(os.getenv("METRICAS_LOG", 60))
+
+# Limites superiores das faixas dos histogramas, em segundos
+FAIXAS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+DESCRICOES = {
+    "jogos_handler_segundos": ("histogram", "Latência dos handlers e rotas do app"),
+    "jogos_handler_erros_total": ("counter", "Exceções nos handlers e rotas do app"),
+    "conceptnet_requisicao_segundos": ("histogram", "Latência das requisições à ConceptNet, por consulta"),
+    "conceptnet_respostas_total": ("counter", "Respostas da ConceptNet, por consulta e código de status"),
+}
+
+
+class Histograma:
+    __slots__ = ("contagens", "soma", "total")
+
+    def __init__(self):
+        # Uma posição por faixa, mais a última para os valores acima de todas (+Inf)
+        self.contagens = [0] * (len(FAIXAS) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.contagens[bisect_left(FAIXAS, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+    # Estimativa do percentil pela interpolação dentro da faixa, como o histogram_quantile do Prometheus
+    def percentil(self, p):
+        if not self.total:
+            return 0
+        alvo = p / 100 * self.total
+        acumulado = 0
+        for indice, contagem in enumerate(self.contagens):
+            if acumulado + contagem >= alvo and contagem:
+                if indice == len(FAIXAS):
+                    return FAIXAS[-1]
+                inicio = FAIXAS[indice - 1] if indice else 0
+                return inicio + (FAIXAS[indice] - inicio) * (alvo - acumulado) / contagem
+            acumulado += contagem
+        return FAIXAS[-1]
+
+
+def _chave(nome, rotulos):
+    return nome, tuple(sorted((rotulo, str(valor)) for rotulo, valor in rotulos.items()))
+
+
+def _rotulos_texto(rotulos, extra=()):
+    pares = [*rotulos, *extra]
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{nome}="{valor.replace(chr(34), chr(39))}"' for nome, valor in pares) + "}"
+
+
+# Histogramas e contadores do processo, por nome e rótulos
+class Metricas:
+    def __init__(self):
+        self._histogramas = {}
+        self._contadores = {}
+        self._medidores = {}
+        self._lock = threading.Lock()
+
+    def observar(self, nome, segundos, **rotulos):
+        chave = _chave(nome, rotulos)
+        with self._lock:
+            histograma = self._histogramas.get(chave)
+            if histograma is None:
+                histograma = self._histogramas[chave] = Histograma()
+            histograma.observar(segundos)
+
+    def contar(self, nome, valor=1, **rotulos):
+        chave = _chave(nome, rotulos)
+        with self._lock:
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    # Valores lidos na hora da exportação (ex.: sessões abertas)
+    def adicionar_medidor(self, nome, descricao, funcao):
+        self._medidores[nome] = (descricao, funcao)
+
+    def _copiar(self):
+        with self._lock:
+            histogramas = {chave: (list(h.contagens), h.soma, h.total) for chave, h in self._histogramas.items()}
+            return histogramas, dict(self._contadores)
+
+    def texto_prometheus(self):
+        histogramas, contadores = self._copiar()
+        linhas = []
+        for nome in sorted({n for n, _ in histogramas} | {n for n, _ in contadores}):
+            tipo, descricao = DESCRICOES.get(nome, ("untyped", nome))
+            linhas += [f"# HELP {nome} {descricao}", f"# TYPE {nome} {tipo}"]
+            for (n, rotulos), (contagens, soma, total) in sorted(histogramas.items()):
+                if n != nome:
+                    continue
+                acumulado = 0
+                for faixa, contagem in zip((*map(str, FAIXAS), "+Inf"), contagens):
+                    acumulado += contagem
+                    linhas.append(f"{nome}_bucket{_rotulos_texto(rotulos, [('le', faixa)])} {acumulado}")
+                linhas.append(f"{nome}_sum{_rotulos_texto(rotulos)} {soma}")
+                linhas.append(f"{nome}_count{_rotulos_texto(rotulos)} {total}")
+            for (n, rotulos), valor in sorted(contadores.items()):
+                if n == nome:
+                    linhas.append(f"{nome}{_rotulos_texto(rotulos)} {valor}")
+        for nome, (descricao, funcao) in sorted(self._medidores.items()):
+            try:
+                valor = funcao()
+            except Exception as e:
+                print(f"Erro ao ler a métrica {nome}: {e}")
+                continue
+            linhas += [f"# HELP {nome} {descricao}", f"# TYPE {nome} gauge", f"{nome} {valor}"]
+        return "\n".join(linhas) + "\n"
+
+    # Uma linha por histograma: chamadas, p50/p95 estimados e erros ou códigos de status
+    def resumo(self):
+        histogramas, contadores = self._copiar()
+        linhas = []
+        for (nome, rotulos), (contagens, soma, total) in sorted(histogramas.items()):
+            if not total:
+                continue
+            h = Histograma()
+            h.contagens, h.total = contagens, total
+            rotulo = ",".join(str(valor) for _, valor in rotulos)
+            if nome == "jogos_handler_segundos":
+                extra = f"{contadores.get(('jogos_handler_erros_total', rotulos), 0)} erros"
+            else:
+                status = [(dict(r)["status"], v) for (n, r), v in sorted(contadores.items())
+                          if n == "conceptnet_respostas_total" and dict(r).get("consulta") == dict(rotulos).get("consulta")]
+                extra = ", ".join(f"{codigo}: {valor}" for codigo, valor in status)
+            linhas.append(f"{nome}[{rotulo}]: {total} chamadas, média {soma / total * 1000:.0f} ms, "
+                          f"p50 {h.percentil(50) * 1000:.0f} ms, p95 {h.percentil(95) * 1000:.0f} ms, {extra}")
+        return linhas
+
+
+metricas = Metricas()
+
+
+# Mede a latência e conta as exceções de um handler (função comum ou async).
+# Com as métricas desligadas devolve a própria função, sem custo nenhum
+def medir(nome):
+    def decorar(funcao):
+        if not METRICAS_ATIVAS:
+            return funcao
+
+        if inspect.iscoroutinefunction(funcao):
+            @functools.wraps(funcao)
+            async def medida_async(*args, **kwargs):
+                inicio = time.perf_counter()
+                try:
+                    return await funcao(*args, **kwargs)
+                except Exception:
+                    metricas.contar("jogos_handler_erros_total", handler=nome)
+                    raise
+                finally:
+                    metricas.observar("jogos_handler_segundos", time.perf_counter() - inicio, handler=nome)
+            return medida_async
+
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            except Exception:
+                metricas.contar("jogos_handler_erros_total", handler=nome)
+                raise
+            finally:
+                metricas.observar("jogos_handler_segundos", time.perf_counter() - inicio, handler=nome)
+        return medida
+    return decorar
+
+
+# Requisição à ConceptNet: latência por consulta e o código de status (ou o
+# tipo do erro, quando não houve resposta)
+def registrar_requisicao(consulta, status, segundos):
+    metricas.observar("conceptnet_requisicao_segundos", segundos, consulta=consulta)
+    metricas.contar("conceptnet_respostas_total", consulta=consulta, status=status)
+
+
+def _criar_handler():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            corpo = metricas.texto_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def _registrar_no_log():
+    while True:
+        time.sleep(METRICAS_LOG)
+        for linha in metricas.resumo():
+            print(f"[metricas] {linha}")
+
+
+# Sobe o endpoint e o log periódico, conforme a configuração
+def iniciar_metricas():
+    if not METRICAS_ATIVAS:
+        return
+    if METRICAS_PORTA:
+        try:
+            servidor = ThreadingHTTPServer(("127.0.0.1", METRICAS_PORTA), _criar_handler())
+        except OSError as e:
+            print(f"Não foi possível abrir as métricas na porta {METRICAS_PORTA}: {e}")
+        else:
+            threading.Thread(target=servidor.serve_forever, name="metricas", daemon=True).start()
+            print(f"Métricas em http://127.0.0.1:{METRICAS_PORTA}/metrics")
+    if METRICAS_LOG:
+        threading.Thread(target=_registrar_no_log, name="metricas-log", daemon=True).start()
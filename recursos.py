@@ -0,0 +1,71 @@
+import json
+import mimetypes
+import os
+import re
+from functools import lru_cache
+
+from construir_assets import ARQUIVO_MANIFESTO, PASTA_ASSETS, TAMANHO_HASH
+
+# Validade do cache dos arquivos versionados no navegador (um ano). O hash no
+# nome muda junto com o conteúdo, então o navegador nunca precisa perguntar de novo
+CACHE_ASSETS_IDADE = 365 * 24 * 3600
+
+_ASSET_VERSIONADO = re.compile(rf"\.[0-9a-f]{{{TAMANHO_HASH}}}\.\w+$")
+
+
+@lru_cache(maxsize=1)
+def _manifesto():
+    try:
+        with open(os.path.join(PASTA_ASSETS, ARQUIVO_MANIFESTO), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Manifesto dos assets não encontrado ({e}); rode python construir_assets.py")
+        return {}
+
+
+# Caminho, dentro de assets/, da versão gerada de um arquivo de assets_fonte/
+def url_asset(nome):
+    caminho = _manifesto().get(nome)
+    if caminho is None:
+        print(f"Asset {nome} fora do manifesto; rode python construir_assets.py")
+        caminho = nome
+    return "/" + caminho
+
+
+# O servidor web do Flet não deixa configurar cabeçalhos, então a resposta dos
+# arquivos estáticos é embrulhada: os versionados saem com cache longo e, se o
+# navegador aceitar, na versão .gz gerada pelo construir_assets.py. Os demais
+# arquivos (index.html, o próprio Flet) continuam como antes.
+# Servidores do Flet sem FastAPI/Starlette (versões antigas) ficam como estão
+def ativar_cache_assets():
+    try:
+        from flet.fastapi.flet_static_files import FletStaticFiles
+        from starlette.datastructures import Headers
+        from starlette.responses import FileResponse
+        from starlette.staticfiles import NotModifiedResponse
+    except ImportError:
+        return False
+    if getattr(FletStaticFiles, "cache_assets", False):
+        return True
+    responder = FletStaticFiles.file_response
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        if status_code != 200 or not _ASSET_VERSIONADO.search(str(full_path)):
+            return responder(self, full_path, stat_result, scope, status_code)
+
+        cabecalhos = {"Cache-Control": f"public, max-age={CACHE_ASSETS_IDADE}, immutable", "Vary": "Accept-Encoding"}
+        pedido = Headers(scope=scope)
+        comprimido = f"{full_path}.gz"
+        if "gzip" in pedido.get("accept-encoding", "") and os.path.exists(comprimido):
+            cabecalhos["Content-Encoding"] = "gzip"
+            response = FileResponse(comprimido, headers=cabecalhos, media_type=mimetypes.guess_type(str(full_path))[0],
+                                    stat_result=os.stat(comprimido))
+        else:
+            response = FileResponse(full_path, headers=cabecalhos, stat_result=stat_result)
+        if self.is_not_modified(response.headers, pedido):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    FletStaticFiles.file_response = file_response
+    FletStaticFiles.cache_assets = True
+    return True
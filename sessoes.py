@@ -0,0 +1,159 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Configuração da limpeza de sessões (pode ser alterada por variáveis de ambiente)
+SESSOES_OCIOSIDADE = int(os.getenv("SESSOES_OCIOSIDADE", 20 * 60))
+SESSOES_ORCAMENTO = int(os.getenv("SESSOES_ORCAMENTO_MB", 256)) * 1024 * 1024
+SESSOES_VARREDURA = int(os.getenv("SESSOES_VARREDURA", 30))
+# A cada quantas varreduras os indicadores vão para o log (0 desliga)
+SESSOES_LOG_VARREDURAS = int(os.getenv("SESSOES_LOG_VARREDURAS", 10))
+
+# Estimativa de memória de uma sessão, medida com medir_memoria.py: o custo fixo
+# da página mais um valor por controle montado
+BYTES_POR_SESSAO = 12 * 1024
+BYTES_POR_CONTROLE = 2400
+
+
+def estimar_bytes(page):
+    total = BYTES_POR_SESSAO + BYTES_POR_CONTROLE * len(page.index)
+    palavras = page.session.get("palavras_relacionadas") or []
+    total += sys.getsizeof(palavras) + sum(sys.getsizeof(palavra) for palavra in palavras)
+    cache_views = page.session.get("cache_views")
+    if cache_views is not None:
+        # Views guardadas que não estão montadas também ocupam memória
+        montadas = set(map(id, page.views))
+        for view in cache_views.views():
+            if id(view) not in montadas:
+                total += BYTES_POR_CONTROLE * contar_controles(view)
+    return total
+
+
+def contar_controles(controle):
+    return 1 + sum(contar_controles(filho) for filho in controle._get_children())
+
+
+class InfoSessao:
+    __slots__ = ("page", "ultimo_uso", "bytes", "liberada")
+
+    def __init__(self, page):
+        self.page = page
+        self.ultimo_uso = time.monotonic()
+        self.bytes = 0
+        self.liberada = False
+
+
+# Sessões abertas no servidor, da usada há mais tempo para a mais recente. Uma
+# varredura periódica libera o estado das sessões ociosas (abas esquecidas
+# abertas) e, se a memória estimada passar do orçamento, das menos usadas.
+# Liberar não fecha a conexão: a sessão volta do zero se o jogador continuar
+class RegistroSessoes:
+    def __init__(self, liberar, ociosidade=SESSOES_OCIOSIDADE, orcamento=SESSOES_ORCAMENTO):
+        self.liberar = liberar
+        self.ociosidade = ociosidade
+        self.orcamento = orcamento
+        self.liberadas = 0
+        self._sessoes = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Registra a página e passa a contar cada evento vindo do navegador como uso
+    def registrar(self, page):
+        with self._lock:
+            self._sessoes[page.session_id] = InfoSessao(page)
+
+        receber = page.on_event_async
+
+        async def on_event_async(e):
+            self.tocar(page)
+            await receber(e)
+
+        page.on_event_async = on_event_async
+
+    def tocar(self, page):
+        with self._lock:
+            info = self._sessoes.get(page.session_id)
+            if info is not None:
+                info.ultimo_uso = time.monotonic()
+                info.liberada = False
+                self._sessoes.move_to_end(page.session_id)
+
+    def remover(self, page):
+        with self._lock:
+            self._sessoes.pop(page.session_id, None)
+
+    def varrer(self):
+        agora = time.monotonic()
+        with self._lock:
+            infos = list(self._sessoes.values())
+
+        a_liberar = []
+        total = 0
+        for info in infos:
+            if info.liberada:
+                continue
+            if agora - info.ultimo_uso > self.ociosidade:
+                a_liberar.append(info)
+            else:
+                info.bytes = estimar_bytes(info.page)
+                total += info.bytes
+
+        # Acima do orçamento, libera as menos usadas recentemente (a lista já está nessa ordem)
+        ociosas = set(map(id, a_liberar))
+        for info in infos:
+            if total <= self.orcamento:
+                break
+            if not info.liberada and id(info) not in ociosas:
+                a_liberar.append(info)
+                total -= info.bytes
+
+        # Liberar mexe nos controles da página, o que só pode ser feito no loop
+        # dela: a varredura só agenda. Marcada já aqui, a sessão não é agendada
+        # de novo enquanto espera a vez
+        for info in a_liberar:
+            info.liberada = True
+            try:
+                info.page.loop.call_soon_threadsafe(self._liberar, info)
+            except RuntimeError as e:
+                # Loop já encerrado: a conexão caiu e a sessão vai ser removida
+                print(f"Erro ao liberar a sessão {info.page.session_id}: {e}")
+
+    def _liberar(self, info):
+        # O jogador voltou a jogar enquanto a liberação esperava no loop
+        if not info.liberada:
+            return
+        try:
+            self.liberar(info.page)
+        except Exception as e:
+            print(f"Erro ao liberar a sessão {info.page.session_id}: {e}")
+        info.bytes = estimar_bytes(info.page)
+        self.liberadas += 1
+
+    def estatisticas(self):
+        with self._lock:
+            infos = list(self._sessoes.values())
+        return {
+            "sessoes": len(infos),
+            "sessoes_ativas": sum(1 for info in infos if not info.liberada),
+            "bytes_retidos": sum(info.bytes for info in infos),
+            "orcamento": self.orcamento,
+            "liberadas": self.liberadas,
+        }
+
+    def _executar(self):
+        varreduras = 0
+        while True:
+            time.sleep(SESSOES_VARREDURA)
+            self.varrer()
+            varreduras += 1
+            if SESSOES_LOG_VARREDURAS and varreduras % SESSOES_LOG_VARREDURAS == 0:
+                e = self.estatisticas()
+                print(f"Sessões: {e['sessoes']} ({e['sessoes_ativas']} ativas), "
+                      f"{e['bytes_retidos'] / 1024 / 1024:.1f} MiB retidos, {e['liberadas']} liberadas")
+
+    # Varre as sessões em segundo plano
+    def iniciar(self):
+        thread = threading.Thread(target=self._executar, name="sessoes", daemon=True)
+        thread.start()
+        return thread
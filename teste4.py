@@ -1,35 +1,21 @@
 import flet as ft
 import random
 
+from baralho import Baralho
+from conteudo import obter_pacote
+from correspondencia import indice_respostas
+from indice_letras import descrever_resposta, indice_do_catalogo
+
 class WordMatrixApp(ft.Column):
     def __init__(self):
         super().__init__(alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=20)
-        self.words = [
-            "Gol", "Bola", "Time", "Jogador", "Técnico", "Goleiro", "Zagueiro", "Atacante", "Meia", "Lateral",
-            "Artilheiro", "Cartão", "Falta", "Escanteio", "Pênalti", "Torcida", "Estádio", "Camisa", "Treino", "Apito"
-        ]
-        self.animal_icons = {
-            "🐶": "Cachorro",
-            "🐱": "Gato",
-            "🐭": "Rato",
-            "🐹": "Hamster",
-            "🐰": "Coelho",
-            "🦊": "Raposa",
-            "🐻": "Urso",
-            "🐼": "Panda",
-            "🐨": "Coala",
-            "🐯": "Tigre",
-            "🦁": "Leão",
-            "🐮": "Vaca",
-            "🐷": "Porco",
-            "🐸": "Sapo",
-            "🐵": "Macaco",
-            "🐔": "Galinha",
-            "🐧": "Pinguim",
-            "🐦": "Pássaro",
-            "🐤": "Pintinho",
-            "🦅": "Águia"
-        }
+        # Palavras de futebol e animais vêm do pacote de conteúdo (construir_pacotes.py)
+        pacote = obter_pacote()
+        self.words = pacote.tema("futebol")
+        self.animals = pacote.tema("animais")
+        self.words_deck = Baralho(self.words)
+        self.animals_deck = Baralho(self.animals)
+        self.answers_given = {}
         # Escolhe aleatoriamente entre palavras e ícones de animais
         self.is_animal_mode = random.choice([True, False])
         self.selected_item = self.get_random_item()
@@ -49,7 +35,7 @@ class WordMatrixApp(ft.Column):
         self.result_text = ft.Text("", size=18, weight=ft.FontWeight.BOLD, text_align=ft.TextAlign.CENTER)
         
         self.letter_count_field = ft.TextField(
-            label="Quantas letras 'P' há no nome?",
+            label=self.question.texto,
             text_align=ft.TextAlign.CENTER,
             on_submit=self.check_letter_count,
             width=300
@@ -72,12 +58,16 @@ class WordMatrixApp(ft.Column):
             self.reload_button
         ])
     
+    # Item mostrado: a figura do animal ou a palavra; o nome é a resposta certa.
+    # A pergunta de contagem sai do índice de letras do tema
     def get_random_item(self):
-        if self.is_animal_mode:
-            icon, name = random.choice(list(self.animal_icons.items()))
-            return icon
-        else:
-            return random.choice(self.words)
+        catalog, deck = (self.animals, self.animals_deck) if self.is_animal_mode else (self.words, self.words_deck)
+        index = self.correct_index = deck.tirar_indice()
+        item = catalog[index]
+        self.correct_name = item.nome
+        self.answers = indice_respostas(catalog)
+        self.question = indice_do_catalogo(catalog).sortear_pergunta(index, deck.aleatorio, self.answers_given)
+        return item.figura if self.is_animal_mode else item.nome
     
     def reload_item(self, e):
         self.is_animal_mode = random.choice([True, False])
@@ -86,43 +76,44 @@ class WordMatrixApp(ft.Column):
         self.word_display.size = 60 if self.is_animal_mode else 24
         self.input_field.value = ""
         self.letter_count_field.value = ""
+        self.letter_count_field.label = self.question.texto
         self.result_text.value = ""
         self.letter_count_result.value = ""
         self.update()
     
     def check_word(self, e):
+        # Aceita sem acento e com poucos erros de digitação (correspondencia.py)
+        match = self.answers.conferir(self.input_field.value, self.correct_index)
         if self.is_animal_mode:
-            correct_name = self.animal_icons.get(self.selected_item, "")
-            if self.input_field.value.lower() == correct_name.lower():
+            if match is not None:
                 self.result_text.value = "Correto! Você digitou o nome do animal corretamente."
             else:
-                self.result_text.value = f"Incorreto! O nome correto é: {correct_name}."
+                self.result_text.value = f"Incorreto! O nome correto é: {self.correct_name}."
         else:
-            if self.input_field.value.lower() == self.selected_item.lower():
+            if match is not None:
                 self.result_text.value = "Correto! Você digitou a palavra corretamente."
             else:
                 self.result_text.value = f"Incorreto! A palavra correta é: {self.selected_item}."
+        if match is not None and match.distancia:
+            self.result_text.value += f" Escreve-se: {self.correct_name}."
         self.update()
     
     def check_letter_count(self, e):
-        if self.is_animal_mode:
-            correct_name = self.animal_icons.get(self.selected_item, "")
-            correct_count = correct_name.lower().count('p')
-        else:
-            correct_count = self.selected_item.lower().count('p')
+        correct_count = self.question.resposta
         
         if self.letter_count_field.value.isdigit() and int(self.letter_count_field.value) == correct_count:
-            self.letter_count_result.value = "Correto! Número de letras 'P' está certo."
+            self.letter_count_result.value = "Correto! A contagem está certa."
         else:
-            self.letter_count_result.value = f"Incorreto! O número correto de 'P' é: {correct_count}."
+            self.letter_count_result.value = f"Incorreto! {descrever_resposta(self.question)}."
         self.update()
 
 
 class LetterClickGame(ft.Column):
     def __init__(self):
         super().__init__(alignment=ft.MainAxisAlignment.CENTER, horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=20)
-        self.words = ["Casa", "Carro", "Computador", "Livro", "Caneta", "Mesa", "Cadeira", "Janela", "Porta", "Lápis"]
-        self.selected_word = random.choice(self.words)
+        self.words = obter_pacote().tema("escola")
+        self.words_deck = Baralho(self.words)
+        self.selected_word = self.words_deck.tirar().nome
         self.shuffled_word = self.shuffle_word(self.selected_word)
         self.current_letter_index = 0
         self.letter_buttons = self.create_letter_buttons()
@@ -181,7 +172,7 @@ class LetterClickGame(ft.Column):
         self.update()
     
     def reload_word(self, e):
-        self.selected_word = random.choice(self.words)
+        self.selected_word = self.words_deck.tirar().nome
         self.shuffled_word = self.shuffle_word(self.selected_word)
         self.current_letter_index = 0
         self.letter_buttons = self.create_letter_buttons()
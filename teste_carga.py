@@ -0,0 +1,589 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+import fake_conceptnet
+from benchmark_busca import percentil
+from conteudo import obter_pacote
+from indice_letras import indice_do_catalogo
+from jogos import TEMA_FIGURAS
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+# Teste de carga do app: vários jogadores simulados, cada um com a sua sessão
+# web do Flet (websocket), jogando como uma criança jogaria: digita uma palavra,
+# clica nas letras, troca de palavra, vai para o jogo de figuras, responde e
+# volta. O número de sessões sobe em etapas e, em cada etapa, o teste mede a
+# latência de cada ação (do envio do evento até a tela mudar), a CPU e a
+# memória do servidor, e aponta a partir de quantas sessões a latência piora.
+#
+#   python teste_carga.py                                  # 10, 25, 50 e 100 sessões
+#   python teste_carga.py --sessoes 50 100 200 400 --duracao 60
+#   python teste_carga.py --trabalhadores 4                # usando o lancador.py
+#   python teste_carga.py --url http://127.0.0.1:8550 --pid 1234   # servidor já no ar
+#
+# O servidor sobe com a ConceptNet falsa (fake_conceptnet.py, em outro
+# processo) e com o cache de palavras em um diretório temporário. Exige o
+# pacote websockets (pip install websockets)
+#
+# Referência (1 núcleo, ConceptNet falsa com 0.2s, 30s por etapa), p95 em ms:
+#
+#   servidores  sessões  CPU   letra  nova_palavra  navegar  resposta  contagem
+#   1           10        3%   3      11            19       4         4
+#   1           50        9%   12     12            31       20        13
+#   2           25        7%   8      14            26       12        7
+#   2           100      22%   14     19            34       15        14
+#
+# Nenhuma etapa degradou nem derrubou sessões até 100 sessões
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_APP = os.path.join(PASTA, "prototipo app python.py")
+ARQUIVO_LANCADOR = os.path.join(PASTA, "lancador.py")
+HOST = "127.0.0.1"
+
+PALAVRAS_SEMENTE = [
+    "gato", "escola", "casa", "bola", "livro", "cachorro", "amigo", "sol", "flor", "mar",
+    "felicidade", "árvore", "lua", "carro", "fruta", "música", "praia", "chuva", "pássaro", "família",
+]
+
+# Ações que a criança espera ver responder na hora; a busca e o autoavanço
+# dependem da ConceptNet e da contagem, e não entram na conta da degradação
+ACOES_INTERATIVAS = ("letra", "nova_palavra", "navegar", "resposta", "contagem")
+
+# Tempo máximo de espera pela resposta de cada ação, em segundos
+LIMITE_ACAO = 10
+LIMITE_BUSCA = 20
+
+# Figuras e nomes do jogo de figuras, do mesmo pacote de conteúdo que o servidor usa
+FIGURAS = obter_pacote().tema(TEMA_FIGURAS)
+LETRAS = indice_do_catalogo(FIGURAS)
+
+
+class AcaoSemResposta(Exception):
+    pass
+
+
+# Latências e falhas de uma etapa, por ação
+class Medicoes:
+    def __init__(self):
+        self.latencias = {}
+        self.falhas = {}
+
+    def registrar(self, acao, latencia):
+        self.latencias.setdefault(acao, []).append(latencia)
+
+    def falhar(self, acao):
+        self.falhas[acao] = self.falhas.get(acao, 0) + 1
+
+    def interativas(self):
+        return [latencia for acao in ACOES_INTERATIVAS for latencia in self.latencias.get(acao, [])]
+
+    def taxa_falhas(self):
+        falhas = sum(self.falhas.get(acao, 0) for acao in ACOES_INTERATIVAS)
+        total = falhas + len(self.interativas())
+        return falhas / total if total else 0
+
+
+# Um navegador simulado: mantém uma cópia da árvore de controles que o servidor
+# manda (como o cliente Flet faz) e responde às chamadas de método da página
+class Jogador:
+    def __init__(self, url_ws, numero, medicoes, pausa):
+        self.url_ws = url_ws
+        self.numero = numero
+        self.medicoes = medicoes
+        self.pausa = pausa
+        self.aleatorio = random.Random(numero)
+        self.controles = {}
+        self.armazenamento = {}
+        self.ws = None
+        self.versao = 0
+        self._mudou = asyncio.Event()
+
+    # --- protocolo ---
+
+    async def enviar(self, acao, payload):
+        await self.ws.send(json.dumps({"action": acao, "payload": payload}, separators=(",", ":")))
+
+    async def conectar(self):
+        self.ws = await websockets.connect(self.url_ws, max_size=None)
+        await self.enviar("registerWebClient", {
+            "pageName": "", "pageRoute": "/", "pageWidth": "1280", "pageHeight": "800",
+            "windowWidth": "1280", "windowHeight": "800", "windowTop": "0", "windowLeft": "0",
+            "isPWA": "false", "isWeb": "true", "isDebug": "false", "platform": "linux",
+            "platformBrightness": "light", "media": "{}", "sessionId": "",
+        })
+
+    async def receber(self):
+        async for dados in self.ws:
+            mensagem = json.loads(dados)
+            await self.processar(mensagem["action"], mensagem["payload"])
+            self.versao += 1
+            self._mudou.set()
+
+    async def processar(self, acao, payload):
+        if acao == "pageControlsBatch":
+            for mensagem in payload:
+                await self.processar(mensagem["action"], mensagem["payload"])
+        elif acao == "registerWebClient":
+            self.controles = payload["session"]["controls"]
+        elif acao == "addPageControls":
+            for controle in payload["controls"]:
+                pai = self.controles.get(controle["p"])
+                if pai is not None and controle["i"] not in pai["c"]:
+                    if "at" in controle:
+                        pai["c"].insert(int(controle["at"]), controle["i"])
+                    else:
+                        pai["c"].append(controle["i"])
+                self.controles[controle["i"]] = controle
+        elif acao == "updateControlProps":
+            for props in payload["props"]:
+                controle = self.controles.get(props["i"])
+                if controle is not None:
+                    controle.update(props)
+        elif acao == "removeControl":
+            for id in payload["ids"]:
+                controle = self.controles.get(id)
+                if controle is not None:
+                    self._descartar_filhos(id)
+                    del self.controles[id]
+                    pai = self.controles.get(controle["p"])
+                    if pai is not None and id in pai["c"]:
+                        pai["c"].remove(id)
+        elif acao == "cleanControl":
+            for id in payload["ids"]:
+                self._descartar_filhos(id)
+        elif acao == "invokeMethod":
+            await self.responder_metodo(payload)
+        elif acao == "sessionCrashed":
+            raise RuntimeError(f"sessão caiu no servidor: {payload['message']}")
+
+    def _descartar_filhos(self, id):
+        controle = self.controles.get(id)
+        if controle is None:
+            return
+        for filho in controle["c"]:
+            self._descartar_filhos(filho)
+            self.controles.pop(filho, None)
+        controle["c"] = []
+
+    # O jogo só usa o armazenamento do navegador (id do jogador) e o foco dos campos
+    async def responder_metodo(self, payload):
+        argumentos = payload.get("arguments") or {}
+        resultado = None
+        if payload["methodName"] == "clientStorage:get":
+            valor = self.armazenamento.get(argumentos["key"])
+            resultado = json.dumps(valor) if valor is not None else None
+        elif payload["methodName"] == "clientStorage:set":
+            self.armazenamento[argumentos["key"]] = argumentos["value"]
+            resultado = "true"
+        if payload["methodId"]:
+            await self.evento("page", "invoke_method_result", json.dumps(
+                {"method_id": payload["methodId"], "result": resultado, "error": None}))
+
+    async def evento(self, alvo, nome, dados=""):
+        await self.enviar("pageEventFromWeb", {"eventTarget": alvo, "eventName": nome, "eventData": dados})
+
+    async def digitar(self, controle, texto):
+        controle["value"] = texto
+        await self.enviar("updateControlProps", {"props": [{"i": controle["i"], "value": texto}]})
+
+    # --- leitura da tela ---
+
+    def tela(self):
+        pagina = self.controles.get("page", {"c": []})
+        views = [self.controles[id] for id in pagina["c"] if self.controles.get(id, {}).get("t") == "view"]
+        return views[-1] if views else None
+
+    def rota(self):
+        tela = self.tela()
+        return tela.get("route") if tela else None
+
+    def descendentes(self, controle):
+        for id in controle["c"]:
+            filho = self.controles.get(id)
+            if filho is not None:
+                yield filho
+                yield from self.descendentes(filho)
+
+    def procurar(self, condicao):
+        tela = self.tela()
+        if tela is None:
+            return []
+        return [c for c in self.descendentes(tela) if c.get("visible") != "false" and condicao(c)]
+
+    def botao(self, texto):
+        encontrados = self.procurar(lambda c: c["t"] == "elevatedbutton" and c.get("text") == texto)
+        if not encontrados:
+            raise AcaoSemResposta(f"botão {texto!r} não encontrado em {self.rota()}")
+        return encontrados[0]
+
+    def campo(self, rotulo):
+        encontrados = self.procurar(lambda c: c["t"] == "textfield" and c.get("label", "").startswith(rotulo))
+        if not encontrados:
+            raise AcaoSemResposta(f"campo {rotulo!r} não encontrado em {self.rota()}")
+        return encontrados[0]
+
+    def texto_filho(self, controle):
+        filhos = [self.controles.get(id) for id in controle["c"]]
+        return next((f.get("value", "") for f in filhos if f and f["t"] == "text"), "")
+
+    # --- ações medidas ---
+
+    # Envia um evento e espera a tela chegar ao estado esperado (por padrão,
+    # qualquer atualização vinda do servidor)
+    async def agir(self, acao, enviar, pronto=None, limite=LIMITE_ACAO):
+        versao = self.versao
+        pronto = pronto or (lambda: self.versao > versao)
+        inicio = time.perf_counter()
+        await enviar()
+        prazo = inicio + limite
+        while not pronto():
+            restante = prazo - time.perf_counter()
+            if restante <= 0:
+                self.medicoes.falhar(acao)
+                raise AcaoSemResposta(f"{acao}: sem resposta em {limite}s")
+            self._mudou.clear()
+            try:
+                await asyncio.wait_for(self._mudou.wait(), restante)
+            except asyncio.TimeoutError:
+                pass
+        self.medicoes.registrar(acao, time.perf_counter() - inicio)
+
+    async def clicar(self, acao, controle, pronto=None):
+        await self.agir(acao, lambda: self.evento(controle["i"], "click"), pronto)
+
+    async def ir_para(self, texto_botao, rota):
+        await self.clicar("navegar", self.botao(texto_botao), lambda: self.rota() == rota)
+
+    async def pensar(self):
+        await asyncio.sleep(self.aleatorio.expovariate(1 / self.pausa) if self.pausa else 0)
+
+    # --- roteiro ---
+
+    async def jogar_letras(self, palavras):
+        for rodada in range(palavras):
+            palavra = next((t.get("value", "")[len("Palavra: "):] for t in self.procurar(lambda c: c["t"] == "text")
+                            if t.get("value", "").startswith("Palavra: ")), "")
+            botoes = [b for b in self.procurar(lambda c: c["t"] == "container" and c.get("width") == "50")]
+            usados = set()
+            for letra in palavra:
+                botao = next((b for b in botoes if b["i"] not in usados and self.texto_filho(b) == letra), None)
+                if botao is None:
+                    break
+                usados.add(botao["i"])
+                await self.pensar()
+                await self.clicar("letra", botao)
+            if rodada < palavras - 1:
+                await self.pensar()
+                await self.clicar("nova_palavra", self.botao("Nova Palavra"))
+
+    async def jogar_figuras(self, animais):
+        for _ in range(animais):
+            posicao = next((FIGURAS.posicao(t["value"]) for t in self.procurar(lambda c: c["t"] == "text")
+                            if t.get("value") and FIGURAS.posicao(t["value"]) is not None), None)
+            if posicao is None:
+                raise AcaoSemResposta("animal não encontrado no jogo de figuras")
+            emoji, nome = FIGURAS[posicao].figura, FIGURAS[posicao].nome
+
+            await self.pensar()
+            contagem = self.campo("Quantas")
+            # A pergunta muda a cada animal: a resposta sai do índice pelo texto do campo
+            pergunta = next(p for p in LETRAS.perguntas(posicao) if p.texto == contagem["label"])
+            await self.digitar(contagem, str(pergunta.resposta))
+            await self.agir("contagem", lambda: self.evento(contagem["i"], "submit"))
+
+            resposta = self.campo("Digite o nome do animal")
+            # De vez em quando erra antes de acertar
+            if self.aleatorio.random() < 0.2:
+                await self.pensar()
+                errado = FIGURAS[self.aleatorio.randrange(len(FIGURAS))].nome
+                await self.digitar(resposta, errado if errado != nome else nome[::-1])
+                await self.agir("resposta", lambda: self.evento(resposta["i"], "submit"))
+
+            await self.pensar()
+            await self.digitar(resposta, nome.lower())
+            inicio = time.perf_counter()
+            await self.agir("resposta", lambda: self.evento(resposta["i"], "submit"))
+            # Depois do acerto a contagem de 3 segundos troca o animal sozinha
+            await self.agir("autoavanco", lambda: asyncio.sleep(0),
+                            lambda: any(t.get("value") and t["value"] != emoji and FIGURAS.buscar(t["value"])
+                                        for t in self.procurar(lambda c: c["t"] == "text")))
+            self.medicoes.latencias["autoavanco"][-1] = time.perf_counter() - inicio
+
+    async def buscar(self):
+        campo = self.campo("Digite uma palavra")
+        await self.digitar(campo, self.aleatorio.choice(PALAVRAS_SEMENTE))
+        await self.agir("busca", lambda: self.evento(campo["i"], "submit"),
+                        lambda: self.rota() == "/jogo_letras", LIMITE_BUSCA)
+
+    async def jogar(self, parar):
+        inicio = time.perf_counter()
+        await self.conectar()
+        recepcao = asyncio.create_task(self.receber())
+        try:
+            await self.agir("conexao", lambda: asyncio.sleep(0),
+                            lambda: self.rota() == "/" and bool(self.procurar(lambda c: c["t"] == "textfield")))
+            self.medicoes.latencias["conexao"][-1] = time.perf_counter() - inicio
+
+            while not parar.is_set():
+                if recepcao.done():
+                    recepcao.result()
+                    raise ConnectionError("conexão fechada pelo servidor")
+                try:
+                    if self.rota() != "/":
+                        await self.ir_para("Voltar", "/")
+                    await self.pensar()
+                    await self.buscar()
+                    await self.jogar_letras(self.aleatorio.randint(1, 3))
+                    await self.pensar()
+                    await self.ir_para("Jogo de Figuras", "/jogo_figuras")
+                    await self.jogar_figuras(self.aleatorio.randint(1, 3))
+                    await self.pensar()
+                    await self.ir_para("Voltar", "/")
+                except AcaoSemResposta as e:
+                    print(f"jogador {self.numero}: {e}")
+        except Exception as e:
+            print(f"jogador {self.numero}: sessão encerrada: {e!r}")
+        finally:
+            recepcao.cancel()
+            await self.ws.close()
+
+
+# --- servidor ---
+
+def iniciar_servidor(porta, trabalhadores, conceptnet, pasta):
+    env = dict(os.environ)
+    env.update({
+        "CONCEPTNET_URL": conceptnet,
+        "INDICE_CONCEPTNET": "",
+        "CACHE_PALAVRAS_ARQUIVO": os.path.join(pasta, "cache_palavras.db"),
+        "AQUECIMENTO_ATIVO": "0",
+        "SESSOES_LOG_VARREDURAS": "0",
+    })
+    if trabalhadores > 1:
+        env["ESTADO_SESSAO"] = "sqlite:" + os.path.join(pasta, "estado_sessoes.db")
+        comando = [sys.executable, ARQUIVO_LANCADOR, "--trabalhadores", str(trabalhadores),
+                   "--porta", str(porta), "--porta-base", str(porta + 1)]
+    else:
+        env.update({"FLET_FORCE_WEB_SERVER": "true", "FLET_SERVER_IP": HOST, "FLET_SERVER_PORT": str(porta)})
+        comando = [sys.executable, ARQUIVO_APP]
+    return subprocess.Popen(comando, env=env, cwd=PASTA, stdout=subprocess.DEVNULL)
+
+
+def servidor_no_ar(url):
+    try:
+        return requests.get(url, timeout=1).status_code == 200
+    except requests.RequestException:
+        return False
+
+
+def esperar_servidor(url, processo, limite=60):
+    prazo = time.monotonic() + limite
+    while time.monotonic() < prazo:
+        if processo is not None and processo.poll() is not None:
+            raise RuntimeError(f"o servidor saiu com código {processo.returncode}")
+        if servidor_no_ar(url):
+            return
+        time.sleep(0.3)
+    raise RuntimeError(f"o servidor não respondeu em {limite}s")
+
+
+# Processo do servidor e os filhos dele (os trabalhadores do lancador.py)
+def arvore_processos(pid):
+    pids = [pid]
+    for pid_atual in pids:
+        try:
+            for tarefa in os.listdir(f"/proc/{pid_atual}/task"):
+                with open(f"/proc/{pid_atual}/task/{tarefa}/children") as f:
+                    pids.extend(int(filho) for filho in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+# CPU acumulada (segundos) e memória residente (bytes) do servidor, lidas do /proc
+def ler_processos(pid):
+    cpu = 0
+    memoria = 0
+    for pid_atual in arvore_processos(pid):
+        try:
+            with open(f"/proc/{pid_atual}/stat") as f:
+                campos = f.read().rsplit(")", 1)[1].split()
+            cpu += (int(campos[11]) + int(campos[12])) / os.sysconf("SC_CLK_TCK")
+            with open(f"/proc/{pid_atual}/status") as f:
+                for linha in f:
+                    if linha.startswith("VmRSS:"):
+                        memoria += int(linha.split()[1]) * 1024
+        except OSError:
+            pass
+    return cpu, memoria
+
+
+# --- etapas ---
+
+async def amostrar_servidor(pid, parar, amostras):
+    while not parar.is_set():
+        amostras.append((time.perf_counter(), *ler_processos(pid)))
+        try:
+            await asyncio.wait_for(parar.wait(), 1)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def executar_etapa(jogadores, tarefas, total, url_ws, args, pid, parar_todos):
+    medicoes = Medicoes()
+    for jogador in jogadores:
+        jogador.medicoes = medicoes
+
+    # As sessões novas entram aos poucos, como uma turma chegando
+    novos = total - len(jogadores)
+    for _ in range(novos):
+        jogador = Jogador(url_ws, len(jogadores), medicoes, args.pausa)
+        jogadores.append(jogador)
+        tarefas.append(asyncio.create_task(jogador.jogar(parar_todos)))
+        await asyncio.sleep(args.abertura / max(novos, 1))
+
+    amostras = []
+    parar_amostras = asyncio.Event()
+    amostragem = asyncio.create_task(amostrar_servidor(pid, parar_amostras, amostras)) if pid else None
+    cpu_cliente = time.process_time()
+    inicio = time.perf_counter()
+    await asyncio.sleep(args.duracao)
+    duracao = time.perf_counter() - inicio
+    cpu_cliente = (time.process_time() - cpu_cliente) / duracao
+    if amostragem:
+        parar_amostras.set()
+        await amostragem
+
+    caidas = sum(1 for tarefa in tarefas if tarefa.done())
+    resultado = {"sessoes": total, "medicoes": medicoes, "caidas": caidas, "cpu_cliente": cpu_cliente,
+                 "cpu": None, "memoria": None}
+    if len(amostras) >= 2:
+        (t0, c0, _), (t1, c1, _) = amostras[0], amostras[-1]
+        resultado["cpu"] = (c1 - c0) / (t1 - t0)
+        resultado["memoria"] = max(m for _, _, m in amostras)
+    return resultado
+
+
+def mostrar_etapa(r):
+    m = r["medicoes"]
+    cpu = f"{r['cpu']:.0%}" if r["cpu"] is not None else "-"
+    memoria = f"{r['memoria'] / 1024 / 1024:.0f} MiB" if r["memoria"] is not None else "-"
+    print(f"\n{r['sessoes']} sessões: CPU do servidor {cpu}, memória {memoria}, "
+          f"{r['caidas']} sessões caídas, CPU do gerador {r['cpu_cliente']:.0%}")
+    print(f"  {'ação':14} {'n':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'falhas':>6}")
+    for acao in ("conexao", "busca", *ACOES_INTERATIVAS, "autoavanco"):
+        latencias = m.latencias.get(acao, [])
+        falhas = m.falhas.get(acao, 0)
+        if not latencias and not falhas:
+            continue
+        p = [percentil(latencias, q) * 1000 if latencias else 0 for q in (50, 95, 99)]
+        print(f"  {acao:14} {len(latencias):>6} {p[0]:8.0f} {p[1]:8.0f} {p[2]:8.0f} {falhas:>6}")
+    if r["cpu_cliente"] > 0.8:
+        print("  aviso: o gerador de carga está perto de 100% de CPU; as latências incluem a fila dele")
+
+
+# A latência degrada na primeira etapa em que o p95 das ações interativas passa
+# do limite, fica bem acima do da primeira etapa ou em que as falhas passam de 1%
+def etapa_degradada(resultados, limite_ms, fator):
+    base = None
+    for r in resultados:
+        latencias = r["medicoes"].interativas()
+        if not latencias:
+            continue
+        p95 = percentil(latencias, 95) * 1000
+        if base is None:
+            base = p95
+        if p95 > limite_ms or p95 > base * fator or r["medicoes"].taxa_falhas() > 0.01 or r["caidas"]:
+            return r, p95
+    return None, None
+
+
+async def executar(args, url, pid):
+    url_ws = url.replace("http", "ws", 1).rstrip("/") + "/ws"
+    jogadores = []
+    tarefas = []
+    parar = asyncio.Event()
+    resultados = []
+    try:
+        for total in args.sessoes:
+            resultado = await executar_etapa(jogadores, tarefas, total, url_ws, args, pid, parar)
+            resultados.append(resultado)
+            mostrar_etapa(resultado)
+    finally:
+        parar.set()
+        # Cada jogador termina a ação em andamento e fecha a conexão
+        await asyncio.wait(tarefas, timeout=LIMITE_ACAO) if tarefas else None
+        for tarefa in tarefas:
+            tarefa.cancel()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga com jogadores simulados via websocket")
+    parser.add_argument("--sessoes", type=int, nargs="+", default=[10, 25, 50, 100],
+                        help="sessões simultâneas em cada etapa")
+    parser.add_argument("--duracao", type=float, default=30, help="segundos medidos em cada etapa")
+    parser.add_argument("--abertura", type=float, default=5, help="segundos para abrir as sessões novas de cada etapa")
+    parser.add_argument("--pausa", type=float, default=1.5, help="tempo médio de reação do jogador, em segundos")
+    parser.add_argument("--limite-ms", type=float, default=250, help="p95 aceitável das ações interativas")
+    parser.add_argument("--fator", type=float, default=3, help="piora aceitável do p95 em relação à primeira etapa")
+    parser.add_argument("--porta", type=int, default=8650)
+    parser.add_argument("--trabalhadores", type=int, default=1, help="mais de 1 sobe o servidor pelo lancador.py")
+    parser.add_argument("--latencia", type=float, default=0.2, help="latência da ConceptNet falsa")
+    parser.add_argument("--url", help="usa um servidor já no ar em vez de subir um")
+    parser.add_argument("--pid", type=int, help="processo do servidor já no ar, para medir CPU e memória")
+    args = parser.parse_args()
+
+    if websockets is None:
+        print("O teste de carga exige o pacote websockets (pip install websockets)")
+        raise SystemExit(1)
+
+    conceptnet = servidor = None
+    pasta = tempfile.TemporaryDirectory()
+    try:
+        if args.url:
+            url, pid = args.url, args.pid
+        else:
+            # Com o lancador.py os trabalhadores usam as portas seguintes; um servidor
+            # esquecido nelas seria medido no lugar dos novos
+            portas = [args.porta] + [args.porta + 1 + i for i in range(args.trabalhadores if args.trabalhadores > 1 else 0)]
+            ocupadas = [porta for porta in portas if servidor_no_ar(f"http://{HOST}:{porta}")]
+            if ocupadas:
+                print(f"Porta(s) {', '.join(map(str, ocupadas))} já em uso; escolha outra com --porta")
+                raise SystemExit(1)
+            conceptnet, url_conceptnet = fake_conceptnet.iniciar_processo("--latencia", args.latencia)
+            servidor = iniciar_servidor(args.porta, args.trabalhadores, url_conceptnet, pasta.name)
+            url, pid = f"http://{HOST}:{args.porta}", servidor.pid
+            print(f"ConceptNet falsa em {url_conceptnet} (latência {args.latencia}s), "
+                  f"{args.trabalhadores} servidor(es) em {url}")
+        esperar_servidor(url, servidor)
+
+        resultados = asyncio.run(executar(args, url, pid))
+    finally:
+        for processo in (servidor, conceptnet):
+            if processo is not None:
+                processo.terminate()
+                processo.wait()
+        pasta.cleanup()
+
+    degradada, p95 = etapa_degradada(resultados, args.limite_ms, args.fator)
+    if degradada:
+        print(f"\nA latência degrada a partir de {degradada['sessoes']} sessões (p95 interativo {p95:.0f} ms)")
+    else:
+        print(f"\nSem degradação até {resultados[-1]['sessoes']} sessões")
+
+
+if __name__ == "__main__":
+    main()
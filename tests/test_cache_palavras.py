@@ -0,0 +1,74 @@
+import pytest
+
+import cache_palavras
+from cache_palavras import CachePalavras
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    # Relógio controlado pelo teste: o cache só lê time.time()
+    agora = [1000.0]
+    monkeypatch.setattr(cache_palavras.time, "time", lambda: agora[0])
+    return agora
+
+
+def test_guarda_e_devolve_o_resultado(tmp_path):
+    cache = CachePalavras(tmp_path / "cache.db")
+    assert cache.obter("gato") is None
+    cache.guardar("gato", ["felino", "rato", "leão"])
+    assert cache.obter("gato") == ["felino", "rato", "leão"]
+    # A chave é normalizada
+    assert cache.obter("  GATO ") == ["felino", "rato", "leão"]
+    assert cache.estatisticas() == {"acertos": 2, "falhas": 1, "entradas": 1}
+
+
+def test_entrada_vencida_nao_e_devolvida(tmp_path, relogio):
+    cache = CachePalavras(tmp_path / "cache.db", ttl=60)
+    cache.guardar("gato", ["felino"])
+    relogio[0] += 60
+    assert cache.obter("gato") == ["felino"]
+    assert cache.contem("gato")
+
+    relogio[0] += 1
+    assert cache.obter("gato") is None
+    assert not cache.contem("gato")
+
+    # Guardar de novo renova a validade
+    cache.guardar("gato", ["rato"])
+    assert cache.obter("gato") == ["rato"]
+
+
+def test_descarta_a_usada_ha_mais_tempo(tmp_path, relogio):
+    cache = CachePalavras(tmp_path / "cache.db", max_entradas=2)
+    cache.guardar("gato", ["felino"])
+    relogio[0] += 1
+    cache.guardar("cachorro", ["latido"])
+    relogio[0] += 1
+    # Ler "gato" o torna o mais recente: quem sai é "cachorro"
+    assert cache.obter("gato") == ["felino"]
+    relogio[0] += 1
+    cache.guardar("escola", ["lápis"])
+
+    assert cache.obter("cachorro") is None
+    assert cache.obter("gato") == ["felino"]
+    assert cache.obter("escola") == ["lápis"]
+    assert cache.estatisticas()["entradas"] == 2
+
+
+def test_idiomas_sao_entradas_separadas(tmp_path):
+    cache = CachePalavras(tmp_path / "cache.db")
+    cache.guardar("gato", ["felino"])
+    cache.guardar("gato", ["cat"], idioma="en")
+    assert cache.obter("gato") == ["felino"]
+    assert cache.obter("gato", idioma="en") == ["cat"]
+
+
+def test_mais_usadas_ignora_as_antigas(tmp_path, relogio):
+    cache = CachePalavras(tmp_path / "cache.db")
+    cache.guardar("antiga", ["a"])
+    relogio[0] += 30 * 24 * 3600
+    cache.guardar("gato", ["felino"])
+    cache.guardar("escola", ["lápis"])
+    for _ in range(3):
+        cache.obter("escola")
+    assert cache.mais_usadas(10) == ["escola", "gato"]
@@ -0,0 +1,111 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from chamada_unica import ChamadaUnica, TransmissaoUnica
+
+
+def test_chamadas_concorrentes_executam_uma_vez():
+    chamada = ChamadaUnica()
+    liberar = threading.Event()
+    execucoes = []
+
+    def buscar(palavra):
+        execucoes.append(palavra)
+        liberar.wait(5)
+        return [palavra + "s"]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futuros = [executor.submit(chamada.executar, "gato", buscar, "gato") for _ in range(8)]
+        # Espera todas as chamadas chegarem antes de deixar a primeira terminar
+        while chamada.estatisticas()["deduplicadas"] < 7:
+            time.sleep(0.001)
+        liberar.set()
+        resultados = [futuro.result(5) for futuro in futuros]
+
+    assert execucoes == ["gato"]
+    assert resultados == [["gatos"]] * 8
+    assert chamada.estatisticas() == {"executadas": 1, "deduplicadas": 7, "em_andamento": 0}
+
+
+def test_chave_fica_livre_quando_a_execucao_termina():
+    chamada = ChamadaUnica()
+    assert chamada.executar("gato", lambda: 1) == 1
+    assert chamada.executar("gato", lambda: 2) == 2
+    assert chamada.estatisticas()["executadas"] == 2
+
+
+def test_erro_chega_a_todos_os_que_esperavam():
+    chamada = ChamadaUnica()
+    liberar = threading.Event()
+
+    def falhar():
+        liberar.wait(5)
+        raise ValueError("ConceptNet fora do ar")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futuros = [executor.submit(chamada.executar, "gato", falhar) for _ in range(3)]
+        while chamada.estatisticas()["deduplicadas"] < 2:
+            time.sleep(0.001)
+        liberar.set()
+        for futuro in futuros:
+            with pytest.raises(ValueError):
+                futuro.result(5)
+
+    # A falha não fica guardada: a próxima chamada executa de novo
+    assert chamada.executar("gato", lambda: "ok") == "ok"
+
+
+def test_submeter_devolve_o_mesmo_futuro():
+    chamada = ChamadaUnica()
+    liberar = threading.Event()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        primeiro = chamada.submeter(executor, "/c/pt/gato", liberar.wait, 5)
+        segundo = chamada.submeter(executor, "/c/pt/gato", liberar.wait, 5)
+        outro = chamada.submeter(executor, "/c/pt/rato", lambda: "rato")
+        assert primeiro is segundo
+        assert outro is not primeiro
+        liberar.set()
+        primeiro.result(5)
+        outro.result(5)
+
+    assert chamada.estatisticas() == {"executadas": 2, "deduplicadas": 1, "em_andamento": 0}
+
+
+def test_transmissao_entrega_todos_os_lotes_a_cada_leitor():
+    transmissao = TransmissaoUnica()
+    liberar = threading.Event()
+    execucoes = []
+
+    def produzir(publicar, palavra):
+        execucoes.append(palavra)
+        publicar([palavra])
+        liberar.wait(5)
+        publicar(["rato", "leite"])
+
+    primeiro = transmissao.assinar("gato", produzir, "gato")
+    assert next(primeiro) == ["gato"]
+    # Quem chega depois recebe também os lotes que já tinham saído
+    segundo = transmissao.assinar("gato", produzir, "gato")
+    liberar.set()
+    assert list(primeiro) == [["rato", "leite"]]
+    assert list(segundo) == [["gato"], ["rato", "leite"]]
+    assert execucoes == ["gato"]
+    assert transmissao.estatisticas() == {"executadas": 1, "deduplicadas": 1, "em_andamento": 0}
+
+
+def test_transmissao_repassa_o_erro_e_libera_a_chave():
+    transmissao = TransmissaoUnica()
+
+    def falhar(publicar):
+        publicar(["parcial"])
+        raise ValueError("ConceptNet fora do ar")
+
+    lotes = transmissao.assinar("gato", falhar)
+    assert next(lotes) == ["parcial"]
+    with pytest.raises(ValueError):
+        next(lotes)
+    assert list(transmissao.assinar("gato", lambda publicar: publicar(["ok"]))) == [["ok"]]
+    assert transmissao.estatisticas()["executadas"] == 2
@@ -0,0 +1,76 @@
+import random
+
+from correspondencia import IndiceRespostas, distancia_aceita, normalizar
+
+
+# Distância OSA (edição com transposição de letras vizinhas) sem limite, pela tabela completa
+def osa(a, b):
+    d = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i][0] = i
+    for j in range(len(b) + 1):
+        d[0][j] = j
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[len(a)][len(b)]
+
+
+# Todos os nomes que a resposta pode ser, percorrendo o catálogo inteiro. Como
+# no índice, se a resposta é exatamente um nome, os parecidos não entram
+def varredura(nomes, resposta):
+    chave = normalizar(resposta)
+    if not chave:
+        return set()
+    encontrados = set()
+    for indice, nome in enumerate(nomes):
+        alvo = normalizar(nome)
+        distancia = osa(chave, alvo)
+        if distancia <= distancia_aceita(alvo):
+            encontrados.add((indice, distancia))
+    exatos = {(indice, distancia) for indice, distancia in encontrados if distancia == 0}
+    return exatos or encontrados
+
+
+def errar(aleatorio, texto, erros):
+    letras = list(texto)
+    for _ in range(erros):
+        posicao = aleatorio.randrange(len(letras))
+        operacao = aleatorio.choice("trocar inserir apagar transpor".split())
+        if operacao == "trocar":
+            letras[posicao] = aleatorio.choice("abcdeilmorsu")
+        elif operacao == "inserir":
+            letras.insert(posicao, aleatorio.choice("abcdeilmorsu"))
+        elif operacao == "apagar" and len(letras) > 1:
+            del letras[posicao]
+        elif operacao == "transpor" and posicao + 1 < len(letras):
+            letras[posicao], letras[posicao + 1] = letras[posicao + 1], letras[posicao]
+    return "".join(letras)
+
+
+def test_mesmo_resultado_que_percorrer_o_catalogo():
+    aleatorio = random.Random(7)
+    silabas = ["ca", "cho", "rro", "pa", "ssa", "ro", "le", "ão", "ga", "to", "bo", "i", "mé", "lu", "ri"]
+    nomes = ["".join(aleatorio.choice(silabas) for _ in range(aleatorio.randint(1, 5))) for _ in range(300)]
+    nomes += ["Pé-de-moleque", "Leão", "Leao", "Tamanduá-bandeira", "Boi", "Bói"]
+    indice = IndiceRespostas(nomes)
+
+    respostas = [errar(aleatorio, aleatorio.choice(nomes), aleatorio.randint(0, 3)) for _ in range(300)]
+    respostas += ["pe de moleque", "LEAO", "tamandua bandeira", "tamanduabandeira", "", "   ", "b", "zzzzzz"]
+    for resposta in respostas:
+        correspondencias = indice.procurar(resposta)
+        assert {(c.indice, c.distancia) for c in correspondencias} == varredura(nomes, resposta), resposta
+        distancias = [c.distancia for c in correspondencias]
+        assert distancias == sorted(distancias)
+        assert all(c.nome == nomes[c.indice] for c in correspondencias)
+
+
+def test_conferir():
+    indice = IndiceRespostas(["Cachorro", "Pássaro", "Gato", "Pato"])
+    assert indice.conferir("cachoro", 0).distancia == 1
+    assert indice.conferir("PASSARO", 1).distancia == 0
+    # Nomes curtos não aceitam erro: "pato" não vale para "Gato"
+    assert indice.conferir("pato", 2) is None
+    assert indice.conferir("gato", 2).nome == "Gato"
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from dificuldade import (ALVO_INICIAL, CANDIDATOS, CLIQUES_AVALIADOS, PASSO_ALVO, SeletorPalavras, pontuar,
+                         selecionar_por_dificuldade)
+
+PALAVRAS = ["gato", "rato", "leão", "cachorro", "pássaro", "hipopótamo", "ornitorrinco", "zebra", "kiwi", "jacaré",
+            "boi", "abelha", "tamanduá", "coelho", "xícara", "yakisoba", "girafa", "peixe", "urso", "lobo"]
+
+
+def test_nenhuma_palavra_se_repete_na_volta():
+    seletor = SeletorPalavras(list(PALAVRAS), semente=1)
+    for _ in range(3):
+        volta = [seletor.tirar() for _ in PALAVRAS]
+        assert sorted(volta) == sorted(PALAVRAS)
+
+
+def test_ultima_da_volta_nao_abre_a_proxima():
+    for semente in range(50):
+        seletor = SeletorPalavras(list(PALAVRAS[:4]), semente=semente)
+        anterior = None
+        for _ in range(40):
+            atual = seletor.tirar_indice()
+            assert atual != anterior
+            anterior = atual
+
+
+def test_sai_perto_do_alvo():
+    seletor = SeletorPalavras(list(PALAVRAS), semente=3)
+    pontuacoes = sorted(pontuar(p) for p in PALAVRAS)
+    # Na primeira palavra todas estão disponíveis: ela é uma das CANDIDATOS mais próximas do alvo
+    limite = sorted(abs(p - ALVO_INICIAL) for p in pontuacoes)[CANDIDATOS - 1]
+    assert abs(pontuar(seletor.tirar()) - ALVO_INICIAL) <= limite
+
+
+def test_alvo_acompanha_os_acertos():
+    seletor = SeletorPalavras(list(PALAVRAS), semente=0)
+    for _ in range(CLIQUES_AVALIADOS):
+        seletor.registrar(True)
+    seletor.tirar()
+    assert seletor.alvo == pytest.approx(ALVO_INICIAL + PASSO_ALVO)
+
+    for _ in range(CLIQUES_AVALIADOS):
+        seletor.registrar(False)
+    seletor.tirar()
+    assert seletor.alvo == pytest.approx(ALVO_INICIAL)
+
+
+def test_palavras_que_chegam_depois_entram_na_volta():
+    palavras = list(PALAVRAS[:5])
+    seletor = SeletorPalavras(palavras, semente=2)
+    tiradas = [seletor.tirar() for _ in range(3)]
+    palavras.extend(PALAVRAS[5:])
+    tiradas += [seletor.tirar() for _ in range(len(PALAVRAS) - 3)]
+    assert sorted(tiradas) == sorted(PALAVRAS)
+
+
+def test_restaurar_continua_a_volta():
+    seletor = SeletorPalavras(list(PALAVRAS), semente=4)
+    tiradas = [seletor.tirar() for _ in range(7)]
+
+    outro = SeletorPalavras(list(PALAVRAS), semente=5)
+    assert outro.restaurar(seletor.estado())
+    tiradas += [outro.tirar() for _ in range(len(PALAVRAS) - 7)]
+    assert sorted(tiradas) == sorted(PALAVRAS)
+
+    # Estado de outra lista (índices que não existem nesta) é recusado
+    curto = SeletorPalavras(list(PALAVRAS[:3]))
+    assert not curto.restaurar(seletor.estado())
+    assert curto.alvo == ALVO_INICIAL
+
+
+def test_pesos_da_lista_mudam_a_dificuldade():
+    fraca = SeletorPalavras(["gato"], pesos={})
+    forte = SeletorPalavras(["gato"], pesos={"gato": 4})
+    fraca.tirar()
+    forte.tirar()
+    assert forte._pontuacoes[0] < fraca._pontuacoes[0]
+
+
+def test_selecao_mantem_toda_a_faixa_de_dificuldade():
+    aleatorio = random.Random(9)
+    palavras = ["".join(aleatorio.choice("abcdefghijklmnopqrstuvxzçãé") for _ in range(aleatorio.randint(3, 14)))
+                for _ in range(500)]
+    ordenadas = sorted(palavras, key=pontuar)
+    selecionadas = selecionar_por_dificuldade(palavras, 100)
+    assert len(selecionadas) == 100
+    assert selecionadas == sorted(selecionadas, key=pontuar)
+    assert selecionadas[0] == ordenadas[0] and selecionadas[-1] == ordenadas[-1]
+    assert selecionar_por_dificuldade(palavras[:50], 100) == sorted(palavras[:50], key=pontuar)
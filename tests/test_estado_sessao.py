@@ -0,0 +1,65 @@
+import pytest
+
+import estado_sessao
+from estado_sessao import EstadoJogador, EstadoMemoria, EstadoSQLite
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    agora = [1000.0]
+    monkeypatch.setattr(estado_sessao.time, "time", lambda: agora[0])
+    return agora
+
+
+@pytest.fixture(params=["memoria", "sqlite"])
+def criar(request, tmp_path):
+    if request.param == "memoria":
+        return lambda **opcoes: EstadoMemoria(**opcoes)
+    # Cada chamada abre uma conexão nova no mesmo arquivo, como outro servidor faria
+    return lambda **opcoes: EstadoSQLite(str(tmp_path / "estado.db"), **opcoes)
+
+
+def test_estado_continua_em_outra_conexao(criar):
+    backend = criar()
+    EstadoJogador(backend, "ana").atualizar(acertos=3)
+    assert EstadoJogador(backend, "ana").obter("acertos") == 3
+    assert EstadoJogador(backend, "bia").obter("acertos") is None
+
+
+def test_estado_vencido_e_apagado(criar, relogio):
+    backend = criar(ttl=60)
+    backend.salvar("ana", {"acertos": 3})
+    relogio[0] += 60
+    assert backend.carregar("ana") == {"acertos": 3}
+    relogio[0] += 61
+    assert backend.carregar("ana") == {}
+
+
+def test_quantidade_de_jogadores_e_limitada(criar, relogio, monkeypatch):
+    monkeypatch.setattr(estado_sessao, "ESTADO_LIMPEZA", 0)
+    backend = criar(max_jogadores=2)
+    for jogador in ("ana", "bia", "caio"):
+        relogio[0] += 1
+        backend.salvar(jogador, {"acertos": 1})
+    assert backend.carregar("ana") == {}
+    assert backend.carregar("caio") == {"acertos": 1}
+
+
+def test_sqlite_apaga_os_vencidos_de_todos_os_jogadores(tmp_path, relogio, monkeypatch):
+    monkeypatch.setattr(estado_sessao, "ESTADO_LIMPEZA", 0)
+    backend = EstadoSQLite(str(tmp_path / "estado.db"), ttl=60)
+    for jogador in ("ana", "bia", "caio"):
+        backend.carregar(jogador)
+    relogio[0] += 61
+    backend.salvar("dani", {})
+    assert backend._conexao.execute("SELECT id_jogador FROM estado").fetchall() == [("dani",)]
+
+
+def test_sqlite_carregar_cria_um_registro_so(tmp_path):
+    um = EstadoSQLite(str(tmp_path / "estado.db"))
+    outro = EstadoSQLite(str(tmp_path / "estado.db"))
+    assert um.carregar("ana") == {}
+    um.salvar("ana", {"acertos": 2})
+    # Carregar de novo (outro servidor) não troca o estado que já existe por um vazio
+    assert outro.carregar("ana") == {"acertos": 2}
+    assert outro._conexao.execute("SELECT COUNT(*) FROM estado").fetchone()[0] == 1
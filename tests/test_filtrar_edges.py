@@ -0,0 +1,48 @@
+from benchmark_filtro import filtro_anterior, gerar_payload
+from busca_palavras import filtrar_edges
+
+
+def aresta(inicio, fim, peso=None):
+    edge = {"start": {"@id": f"/c/pt/{inicio.lower()}", "label": inicio},
+            "end": {"@id": f"/c/pt/{fim.lower()}", "label": fim}}
+    if peso is not None:
+        edge["weight"] = peso
+    return edge
+
+
+def test_mesmas_palavras_que_o_laco_aresta_a_aresta():
+    for semente in range(5):
+        edges = gerar_payload("gato", total=2000, semente=semente)["edges"]
+        anterior, atual = set(), set()
+        filtro_anterior(edges, "gato", anterior)
+        filtrar_edges(edges, "/c/pt/gato", atual)
+        assert atual == anterior
+
+
+def test_devolve_so_as_novas_na_ordem_das_arestas():
+    edges = [aresta("gato", "Rato"), aresta("Leite", "gato"), aresta("gato", "rato"), aresta("gato", "miau")]
+    palavras = {"gato", "miau"}
+    assert filtrar_edges(edges, "/c/pt/gato", palavras) == ["rato", "leite"]
+    assert palavras == {"gato", "miau", "rato", "leite"}
+
+
+def test_regras_do_filtro():
+    edges = [aresta("gato", nome) for nome in ("pé", "cor laranja", "numeral", "g@to", "gato 2", "x" * 26, "gato de rua")]
+    assert filtrar_edges(edges, "/c/pt/gato", set()) == ["gato de rua"]
+
+
+def test_ponta_e_o_lado_oposto_ao_no_buscado():
+    edges = [
+        {"start": {"@id": "/c/pt/gato/n/wn/animal", "label": "gato"}, "end": {"@id": "/c/pt/felino", "label": "felino"}},
+        # "/c/pt/gatorade" não é o nó "/c/pt/gato": a palavra é a do início
+        {"start": {"@id": "/c/pt/gatorade", "label": "gatorade"}, "end": {"@id": "/c/pt/gato", "label": "gato"}},
+    ]
+    assert filtrar_edges(edges, "/c/pt/gato", set()) == ["felino", "gatorade"]
+
+
+def test_pesos_guardam_a_aresta_mais_forte_das_novas():
+    edges = [aresta("gato", "rato", 2.0), aresta("Rato", "gato", 3.5), aresta("gato", "leite"), aresta("gato", "miau", 9)]
+    pesos = {}
+    assert filtrar_edges(edges, "/c/pt/gato", {"miau"}, pesos) == ["rato", "leite"]
+    # Sem peso na aresta, a palavra fica sem peso (o dificuldade.py usa o padrão)
+    assert pesos == {"rato": 3.5}
@@ -0,0 +1,54 @@
+from conteudo import Item, obter_pacote
+from jogos import indices_figuras
+
+
+# Catálogo com a mesma interface do Tema do pacote de conteúdo
+class Catalogo:
+    nome = "teste"
+
+    def __init__(self, itens):
+        self.itens = itens
+
+    def __len__(self):
+        return len(self.itens)
+
+    def __getitem__(self, indice):
+        return self.itens[indice]
+
+    def categorias(self):
+        return sorted({item.categoria for item in self.itens})
+
+    def indices(self, categoria=None, dificuldade_min=1, dificuldade_max=5):
+        return [indice for indice, item in enumerate(self.itens)
+                if categoria in (None, item.categoria) and dificuldade_min <= item.dificuldade <= dificuldade_max]
+
+
+CATALOGO = Catalogo([
+    Item("🐶", "Cachorro", "doméstico", 2),
+    Item("", "Capivara", "selvagem", 3),
+    Item("🦁", "Leão", "selvagem", 1),
+    Item("", "Gato", "doméstico", 1),
+])
+
+
+def test_itens_sem_figura_nao_entram():
+    assert list(indices_figuras(CATALOGO, None, (1, 5))) == [0, 2]
+    assert list(indices_figuras(CATALOGO, "selvagem", (1, 5))) == [2]
+    assert list(indices_figuras(CATALOGO, None, (1, 1))) == [2]
+
+
+def test_sem_itens_com_figura_no_filtro_usa_os_do_tema_com_figura():
+    assert list(indices_figuras(CATALOGO, "doméstico", (1, 1))) == [0, 2]
+    assert list(indices_figuras(CATALOGO, "aquático", (1, 5))) == [0, 2]
+
+
+def test_tema_todo_com_figura_e_um_range():
+    catalogo = Catalogo([Item("🐶", "Cachorro", "doméstico", 2), Item("🦁", "Leão", "selvagem", 1)])
+    assert indices_figuras(catalogo, None, (1, 5)) == range(2)
+
+
+def test_tema_do_pacote_com_itens_sem_figura():
+    tema = obter_pacote().tema("futebol")
+    indices = indices_figuras(tema, None, (1, 5))
+    assert indices and all(tema[indice].figura for indice in indices)
+    assert len(indices) < len(tema)